@@ -4,6 +4,8 @@ import argparse
 import json
 import os
 from pathlib import Path
+import threading
+from typing import Optional
 
 import earthaccess
 import geopandas as gpd
@@ -12,7 +14,8 @@ import numpy as np
 import pandas as pd
 from shapely.geometry import Point, box
 
-from zexplorer.data_id_logger import DataSource, log_evidence
+from zexplorer.data_id_logger import DataSource, file_digests, log_evidence
+from zexplorer.granule_search import GranuleQuery, SearchCache, concurrent_search
 
 
 def ring_from_bbox(b):
@@ -30,39 +33,97 @@ def pad_bbox(b, pad_deg=0.5):
     return [b[0] - pad_deg, b[1] - pad_deg, b[2] + pad_deg, b[3] + pad_deg]
 
 
-def search_gedi(bbox, start, end):
-    ring = ring_from_bbox(bbox)
-    # Try cloud, then DAAC; guard empty results each time
-    for daac in (None, "ORNL_DAAC"):
-        try:
-            res = earthaccess.search_data(
-                short_name="GEDI04_C",
-                version="2",
-                temporal=(start, end),
-                polygon=ring,
-                daac=daac,  # daac=None = auto/cloud
+def _ring_key(b):
+    return tuple((float(x), float(y)) for x, y in ring_from_bbox(b))
+
+
+def _encode_granule(g):
+    return {**dict(g), "_cloud_hosted": bool(getattr(g, "cloud_hosted", False))}
+
+
+def _decode_granule(d):
+    from earthaccess.results import DataGranule
+
+    body = {k: v for k, v in d.items() if k != "_cloud_hosted"}
+    return DataGranule(body, cloud_hosted=d.get("_cloud_hosted", False))
+
+
+_login_lock = threading.Lock()
+_logged_in = False
+
+
+def ensure_login():
+    # Earthdata login only when something actually goes to the network
+    global _logged_in
+    with _login_lock:
+        if not _logged_in:
+            earthaccess.login()  # prompts once; cached in ~/.netrc
+            _logged_in = True
+
+
+def _search_data(**kwargs):
+    ensure_login()
+    return earthaccess.search_data(**kwargs)
+
+
+def fetch_granules(granules, out_dir: Path):
+    # Granules whose files are already in out_dir are reused without logging in
+    local, missing = [], []
+    for g in granules:
+        paths = [out_dir / Path(u.split("?", 1)[0]).name for u in g.data_links()]
+        if paths and all(p.exists() for p in paths):
+            local.extend(paths)
+        else:
+            missing.append(g)
+    if missing:
+        ensure_login()
+        local.extend(Path(f) for f in earthaccess.download(missing, str(out_dir)))
+    return local
+
+
+def search_gedi(bbox, start, end, split_months=12, ttl_h=168.0):
+    # Cloud, DAAC and padded-AOI DAAC queries all go out at once (each split into
+    # sub-ranges); the first non-empty one in that priority order wins. Every
+    # sub-query is cached on disk, so re-running over the same AOI stays offline.
+    cands = [
+        GranuleQuery("GEDI04_C", "2", _ring_key(bbox), start, end, daac=None),
+        GranuleQuery("GEDI04_C", "2", _ring_key(bbox), start, end, daac="ORNL_DAAC"),
+        GranuleQuery("GEDI04_C", "2", _ring_key(pad_bbox(bbox, 0.5)), start, end, daac="ORNL_DAAC"),
+    ]
+    i, res = concurrent_search(
+        _search_data,
+        cands,
+        months=split_months,
+        cache=SearchCache(ttl_s=ttl_h * 3600.0),
+        encode=_encode_granule,
+        decode=_decode_granule,
+    )
+    if i == 2:
+        print("Found granules after padding AOI by 0.5°.")
+    return res
+
+
+def log_gedi_evidence(candidate_id, bbox, start, end, files, out_csv: Optional[Path]):
+    granules = ",".join(sorted({os.path.basename(f) for f in files})[:3])
+    # Pin the exact granule bytes (and the points CSV, only if this run wrote it)
+    hashed = [Path(f) for f in files] + ([Path(out_csv)] if out_csv is not None else [])
+    digests = {Path(k).name: v for k, v in file_digests(hashed).items()}
+    log_evidence(
+        lat=(bbox[1] + bbox[3]) / 2,
+        lon=(bbox[0] + bbox[2]) / 2,
+        candidate_id=candidate_id,
+        bbox=bbox,
+        sources=[
+            DataSource(
+                type="GEDI04_C v2 (WSCI)",
+                id=f"granules:{granules}",
+                url="https://gedi.umd.edu/gedi-l4c-footprint-level-waveform-structural-complexity-index-released/",
             )
-            if res:
-                return res
-        except Exception as e:
-            print("Search error (daac=%s): %s" % (daac, e))
-    # Pad AOI and try DAAC once more
-    b2 = pad_bbox(bbox, 0.5)
-    ring2 = ring_from_bbox(b2)
-    try:
-        res = earthaccess.search_data(
-            short_name="GEDI04_C",
-            version="2",
-            temporal=(start, end),
-            polygon=ring2,
-            daac="ORNL_DAAC",
-        )
-        if res:
-            print("Found granules after padding AOI by 0.5°.")
-            return res
-    except Exception as e:
-        print("Search error (padded, DAAC):", e)
-    return []
+        ],
+        notes=(f"Independent evidence: GEDI L4C WSCI search {start}..{end} near AOI"),
+        extra={"input_sha256": digests},
+    )
+    print("Logged GEDI evidence line.")
 
 
 def main():
@@ -73,6 +134,8 @@ def main():
     ap.add_argument("--start", default="2019-04-01")
     ap.add_argument("--end", default="2025-12-31")
     ap.add_argument("--max-granules", type=int, default=6)
+    ap.add_argument("--search-split-months", type=int, default=12)
+    ap.add_argument("--search-ttl-h", type=float, default=168.0, help="Search cache lifetime")
     args = ap.parse_args()
 
     # AOI
@@ -82,12 +145,11 @@ def main():
     else:
         bbox = [-50.0167, -1.3667, -49.1167, -0.4667]  # Marajó fallback
     aoi_poly = box(*bbox)
-    latc = (bbox[1] + bbox[3]) / 2
-    lonc = (bbox[0] + bbox[2]) / 2
 
-    # Auth + search
-    earthaccess.login()  # prompts once; cached in ~/.netrc
-    results = search_gedi(bbox, args.start, args.end)
+    # Search (cached; logs in to Earthdata only on a cache miss)
+    results = search_gedi(
+        bbox, args.start, args.end, split_months=args.search_split_months, ttl_h=args.search_ttl_h
+    )
     if not results:
         print(
             "No GEDI04_C granules found near AOI. You can:\n"
@@ -101,8 +163,8 @@ def main():
     # Download a few
     out_dir = Path(args.outdir)
     out_dir.mkdir(parents=True, exist_ok=True)
-    files = earthaccess.download(results[: args.max_granules], str(out_dir))
-    print(f"Downloaded {len(files)} granules")
+    files = fetch_granules(results[: args.max_granules], out_dir)
+    print(f"Using {len(files)} granule files in {out_dir}")
 
     # Extract WSCI/lat/lon
     rows = []
@@ -170,22 +232,8 @@ def main():
         print("Downloaded granules did not contain WSCI points within AOI.")
 
     # Log evidence (use downloaded granule names even if no WSCI points fell inside AOI)
-    granules = ",".join(sorted({os.path.basename(f) for f in files})[:3])
-    log_evidence(
-        lat=latc,
-        lon=lonc,
-        candidate_id=args.candidate_id,
-        bbox=bbox,
-        sources=[
-            DataSource(
-                type="GEDI04_C v2 (WSCI)",
-                id=f"granules:{granules}",
-                url="https://gedi.umd.edu/gedi-l4c-footprint-level-waveform-structural-complexity-index-released/",
-            )
-        ],
-        notes=(f"Independent evidence: GEDI L4C WSCI search {args.start}..{args.end} near AOI"),
-    )
-    print("Logged GEDI evidence line.")
+    points = out_csv if not df.empty else None  # never pin a stale CSV from an earlier run
+    log_gedi_evidence(args.candidate_id, bbox, args.start, args.end, files, points)
 
 
 if __name__ == "__main__":
@@ -9,16 +9,16 @@ import numpy as np
 from PIL import Image
 from skimage.morphology import binary_opening, disk, remove_small_objects
 from skimage.transform import resize
-import tifffile as tiff
+
+from zexplorer.raster_cache import open_cached
 
 
 def load_gray_db(path: Path) -> np.ndarray:
-    arr = tiff.imread(str(path)).astype("float32")
-    if arr.ndim == 3:
-        arr = arr.squeeze()
+    # Shared decoded cache (same files the pipeline reads); read-only memmap
+    arr = open_cached(path).array
     bad = ~np.isfinite(arr)
     if bad.any():
-        arr[bad] = np.nan
+        arr = np.where(bad, np.nan, arr).astype("float32")
     return arr
 
 
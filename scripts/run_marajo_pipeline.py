@@ -1,8 +1,11 @@
 #!/usr/bin/env python3
 import argparse
 from pathlib import Path
-from typing import Optional
+import tempfile
+import time
+from typing import Iterable, Optional
 
+from affine import Affine
 import geopandas as gpd
 import matplotlib.pyplot as plt
 import numpy as np
@@ -11,13 +14,26 @@ import rasterio
 from rasterio.features import geometry_mask
 from rasterio.warp import Resampling, reproject
 from rasterio.windows import from_bounds
-from skimage.filters import gaussian
+
+from zexplorer.anomaly import score_tiles
+from zexplorer.data_id_logger import DataSource, file_digests, log_evidence, sha256_file
+from zexplorer.gedi_join import iter_gedi_chunks, join_wsci
+from zexplorer.manifest import Manifest, file_digest, stage_key
+from zexplorer.multires import coarse_to_fine, exhaustive, local_relief, recall
+from zexplorer.raster_cache import open_cached
+from zexplorer.sweep import frac_ok_grid, joint_histogram, parse_grid, sensitivity_rows
+from zexplorer.thumbs import colorize_db, contact_sheet, render_overview, stretch_rgb
+from zexplorer.topn import select_topN
 
 ROOT = Path(".")
 EXPORTS = ROOT / "data" / "exports"
 CANDS_RT = ROOT / "data" / "candidates"
 FIGS_RT = ROOT / "figures"
 
+# Hydro-plausibility rule: positive wet–dry S1 change on low local relief
+S1_MIN_DB = 0.5
+REL_MAX_M = 5.0
+
 
 def need(p: Path, msg: str):
     if not p.exists():
@@ -36,49 +52,63 @@ def window_extent(ds: rasterio.io.DatasetReader, win):
     return (left, right, bottom, top)
 
 
-def step_select_topN(coarse_gj: Path, topN: int, out_dir: Path):
-    print(f"[1/3] Selecting top-{topN} hotspots from {coarse_gj.name}")
-    gdf = gpd.read_file(coarse_gj)
-    if gdf.empty:
+def select_frame(coarse_gj: Path, topN: int, key: str = "area_ha"):
+    # Streams features and keeps a bounded heap; areas are equal-area (EPSG:6933) hectares
+    feats = select_topN(coarse_gj, topN, key=key)
+    if not feats:
         raise SystemExit("Hotspot GeoJSON is empty.")
-    if "area_ha" in gdf.columns:
-        gdf = gdf.sort_values("area_ha", ascending=False)
-    else:
-        # compute area in hectares via Web Mercator
-        gm = gdf.to_crs(3857)
-        gdf = gdf.assign(area_ha=gm.area / 10_000.0).sort_values("area_ha", ascending=False)
+    return gpd.GeoDataFrame.from_features(feats, crs="EPSG:4326").reset_index(drop=True)
+
+
+def write_selection(top, out_dir: Path) -> Path:
     out_dir.mkdir(parents=True, exist_ok=True)
-    top = gdf.head(topN).reset_index(drop=True)
     (out_dir / "hotspots_topN.geojson").write_text(top.to_json())
     top[["area_ha"]].to_csv(out_dir / "hotspots_topN.csv", index=False)
-    print("  ->", out_dir / "hotspots_topN.geojson")
+    return out_dir / "hotspots_topN.geojson"
+
+
+def step_select_topN(coarse_gj: Path, topN: int, out_dir: Path, key: str = "area_ha"):
+    print(f"[1/3] Selecting top-{topN} hotspots from {coarse_gj.name} by {key}")
+    top = select_frame(coarse_gj, topN, key=key)
+    print("  ->", write_selection(top, out_dir))
     print("  ->", out_dir / "hotspots_topN.csv")
     return top
 
 
+def align_to(src, ref) -> np.ndarray:
+    """``src`` band on ``ref``'s grid (both cached rasters); bilinear when grids differ."""
+    if (src.shape == ref.shape) and (src.crs == ref.crs) and (src.transform == ref.transform):
+        return src.array
+    out = np.empty(ref.shape, dtype="float32")
+    reproject(
+        source=src.array,
+        destination=out,
+        src_transform=src.transform,
+        src_crs=src.crs,
+        dst_transform=ref.transform,
+        dst_crs=ref.crs,
+        resampling=Resampling.bilinear,
+        num_threads=2,
+    )
+    return out
+
+
+def load_s1_dem(s1_db: Path, dem30: Path):
+    """Cached S1 Δ dB raster and the DEM on its grid (no relief filtering yet)."""
+    rs1 = open_cached(s1_db)
+    return rs1, align_to(open_cached(dem30), rs1)
+
+
+def load_s1_relief(s1_db: Path, dem30: Path):
+    """S1 Δ dB (cached memmap) and local relief on the S1 grid, plus the S1 transform."""
+    rs1, dem_res = load_s1_dem(s1_db, dem30)
+    return rs1.array, local_relief(dem_res), rs1.transform
+
+
 def step_score(top, s1_db: Path, dem30: Path, out_csv: Path):
     print(f"[2/3] Scoring hydro-plausibility using {s1_db.name} + {dem30.name}")
-    with rasterio.open(s1_db) as rs1:
-        s1, s1_tr, s1_crs, s1_sh = rs1.read(1).astype("float32"), rs1.transform, rs1.crs, rs1.shape
-    with rasterio.open(dem30) as rd:
-        dem, dem_tr, dem_crs, dem_sh = rd.read(1).astype("float32"), rd.transform, rd.crs, rd.shape
-    if (dem_sh != s1_sh) or (dem_crs != s1_crs) or (dem_tr != s1_tr):
-        dem_res = np.empty(s1_sh, dtype="float32")
-        reproject(
-            source=dem,
-            destination=dem_res,
-            src_transform=dem_tr,
-            src_crs=dem_crs,
-            dst_transform=s1_tr,
-            dst_crs=s1_crs,
-            resampling=Resampling.bilinear,
-            num_threads=2,
-        )
-    else:
-        dem_res = dem
-    dem_blur = gaussian(dem_res, sigma=5, preserve_range=True)
-    rel = dem_res - dem_blur
-    rel[~np.isfinite(rel)] = np.nan
+    s1, rel, s1_tr = load_s1_relief(s1_db, dem30)
+    s1_sh = s1.shape
     rows = []
     for i, r in top.reset_index(drop=True).iterrows():
         mask = geometry_mask(
@@ -90,7 +120,7 @@ def step_score(top, s1_db: Path, dem30: Path, out_csv: Path):
                 {"idx": i + 1, "area_ha": float(r.get("area_ha", np.nan)), "pix": 0, "frac_ok": 0.0}
             )
             continue
-        ok = (s1 > 0.5) & (rel <= 5.0) & mask & np.isfinite(s1) & np.isfinite(rel)
+        ok = (s1 > S1_MIN_DB) & (rel <= REL_MAX_M) & mask & np.isfinite(s1) & np.isfinite(rel)
         rows.append(
             {
                 "idx": i + 1,
@@ -107,10 +137,228 @@ def step_score(top, s1_db: Path, dem30: Path, out_csv: Path):
     return df
 
 
+def step_sweep(
+    top, s1_db: Path, dem30: Path, s1_thr: np.ndarray, rel_thr: np.ndarray, out_dir: Path
+):
+    print(
+        f"[2b] Threshold sweep: {len(s1_thr)} S1 × {len(rel_thr)} relief thresholds "
+        f"over {len(top)} candidates"
+    )
+    s1, rel, s1_tr = load_s1_relief(s1_db, dem30)
+    hists, pix, idx, area = [], [], [], []
+    for i, r in top.reset_index(drop=True).iterrows():
+        # Only touch the candidate's bounding window, once, whatever the grid size
+        win = from_bounds(*r.geometry.bounds, transform=s1_tr)
+        r0, c0 = int(np.floor(win.row_off)), int(np.floor(win.col_off))
+        r1 = int(np.ceil(win.row_off + win.height))
+        c1 = int(np.ceil(win.col_off + win.width))
+        rs = slice(max(r0, 0), min(r1, s1.shape[0]))
+        cs = slice(max(c0, 0), min(c1, s1.shape[1]))
+        h = np.zeros((len(s1_thr) + 1, len(rel_thr) + 1), dtype="int64")
+        n = 0
+        if rs.stop > rs.start and cs.stop > cs.start:
+            sub_tr = s1_tr * Affine.translation(cs.start, rs.start)
+            mask = geometry_mask(
+                [r.geometry.__geo_interface__],
+                out_shape=(rs.stop - rs.start, cs.stop - cs.start),
+                transform=sub_tr,
+                invert=True,
+            )
+            n = int(mask.sum())
+            h = joint_histogram(s1[rs, cs][mask], rel[rs, cs][mask], s1_thr, rel_thr)
+        hists.append(h)
+        pix.append(n)
+        idx.append(i + 1)
+        area.append(float(r.get("area_ha", np.nan)))
+
+    frac = frac_ok_grid(np.stack(hists), np.array(pix))
+    jj, kk = np.meshgrid(np.arange(len(s1_thr)), np.arange(len(rel_thr)), indexing="ij")
+    tidy = pd.DataFrame(
+        {
+            "idx": np.repeat(idx, jj.size),
+            "area_ha": np.repeat(area, jj.size),
+            "pix": np.repeat(pix, jj.size),
+            "s1_min_db": np.tile(s1_thr[jj.ravel()], len(idx)),
+            "rel_max_m": np.tile(rel_thr[kk.ravel()], len(idx)),
+            "frac_ok": frac.reshape(len(idx), -1).ravel(),
+        }
+    )
+    summary = pd.DataFrame(
+        sensitivity_rows(frac, idx, s1_thr, rel_thr, baseline=(S1_MIN_DB, REL_MAX_M))
+    )
+    out_dir.mkdir(parents=True, exist_ok=True)
+    tidy.to_csv(out_dir / "hotspots_sweep.csv", index=False)
+    summary.to_csv(out_dir / "hotspots_sweep_summary.csv", index=False)
+    print("  ->", out_dir / "hotspots_sweep.csv")
+    print("  ->", out_dir / "hotspots_sweep_summary.csv")
+    return tidy, summary
+
+
+def step_join_gedi(top, gedi_points: Path, ring_m: float, out_csv: Path):
+    print(f"[2c] Joining GEDI WSCI from {gedi_points.name} (ring ≈ {ring_m:.0f} m)")
+    rows = join_wsci(top.geometry.values, iter_gedi_chunks(gedi_points), ring_m=ring_m)
+    df = pd.DataFrame(rows)
+    df.insert(1, "area_ha", top["area_ha"].to_numpy(dtype="float64"))
+    out_csv.parent.mkdir(parents=True, exist_ok=True)
+    df.to_csv(out_csv, index=False)
+    print("  ->", out_csv)
+    print(
+        df[["idx", "n_in", "wsci_mean_in", "n_ring", "wsci_mean_ring", "contrast_mean"]].to_string(
+            index=False
+        )
+    )
+    return df
+
+
+def step_tiles(
+    s1_db: Path, dem30: Path, alos_db: Optional[Path], tile: int, top_k: int, out_csv: Path
+):
+    print(f"[2d] Tile anomaly scoring ({tile}px tiles, IsolationForest)")
+    s1, rel, s1_tr = load_s1_relief(s1_db, dem30)
+    layers = {"s1": s1}
+    if alos_db is not None:
+        layers["alos"] = align_to(open_cached(alos_db), open_cached(s1_db))
+    layers["relief"] = rel
+    res = score_tiles(layers, tile=tile)
+    order = np.argsort(-res.scores, kind="stable")
+    o = res.origins[order]
+    lon, lat = s1_tr * (o[:, 1] + tile / 2.0, o[:, 0] + tile / 2.0)
+    df = pd.DataFrame(res.features[order], columns=res.names)
+    df.insert(0, "rank", np.arange(1, len(df) + 1))
+    df.insert(1, "row", o[:, 0])
+    df.insert(2, "col", o[:, 1])
+    df.insert(3, "lon", lon)
+    df.insert(4, "lat", lat)
+    df.insert(5, "score", res.scores[order])
+    out_csv.parent.mkdir(parents=True, exist_ok=True)
+    df.to_csv(out_csv, index=False)
+    print(
+        f"  {len(df)} of {res.n_tiles} tiles scored ({res.n_tiles - len(df)} below min_valid) "
+        f"at {res.tiles_per_s:.0f} tiles/s"
+    )
+    print("  ->", out_csv)
+    print(df[["rank", "lon", "lat", "score"]].head(top_k).to_string(index=False))
+    return df
+
+
+def step_multires(
+    s1_db: Path, dem30: Path, tile: int, levels: int, min_frac: float, check: bool, out_csv: Path
+):
+    print(f"[2e] Coarse-to-fine search ({levels} levels above {tile}px tiles)")
+    kw = dict(tile=tile, min_frac=min_frac, s1_min=S1_MIN_DB, rel_max=REL_MAX_M)
+    t0 = time.perf_counter()
+    # Relief is derived per surviving block from the DEM, not for the whole AOI up front
+    rs1, dem = load_s1_dem(s1_db, dem30)
+    res = coarse_to_fine(rs1.array, dem=dem, levels=levels, **kw)
+    wall = time.perf_counter() - t0
+    s1_tr = rs1.transform
+    for step, n, kept in res.levels:
+        print(f"  1/{step:<3d} {n:6d} tiles -> {kept:6d}")
+    print(
+        f"  rule on {res.evaluated_px:,} of {res.total_px:,} px, relief on {res.relief_px:,} "
+        f"of {res.relief_total_px:,} DEM px ({res.compute_saved:.1%} of pixel work saved)"
+    )
+    if check:
+        t0 = time.perf_counter()
+        s1, rel, _ = load_s1_relief(s1_db, dem30)
+        truth = exhaustive(s1, rel, **kw)
+        wall_ex = time.perf_counter() - t0
+        print(
+            f"  wall {wall:.2f}s vs exhaustive incl. relief {wall_ex:.2f}s "
+            f"({1 - wall / wall_ex:.1%} saved); recall {recall(res, truth):.3f}"
+        )
+    else:
+        print(f"  wall {wall:.2f}s (--multires-check compares against an exhaustive run)")
+    o = res.origins
+    lon, lat = s1_tr * (o[:, 1] + tile / 2.0, o[:, 0] + tile / 2.0)
+    df = pd.DataFrame(
+        {"row": o[:, 0], "col": o[:, 1], "lon": lon, "lat": lat, "frac_ok": res.scores}
+    ).sort_values("frac_ok", ascending=False)
+    out_csv.parent.mkdir(parents=True, exist_ok=True)
+    df.to_csv(out_csv, index=False)
+    print("  ->", out_csv)
+    return df
+
+
+def candidate_id(rank: int) -> str:
+    return f"marajo-hot-01{rank:02d}"
+
+
+def overview_png(out_dir: Path, rank: int) -> Path:
+    return out_dir / f"{candidate_id(rank)}_overview.png"
+
+
+def log_candidates(top, scores, px: str, digests: dict):
+    """One evidence line per scored candidate, pinning the exact input bytes."""
+    frac = dict(zip(scores["idx"], scores["frac_ok"]))
+    for i, r in top.reset_index(drop=True).iterrows():
+        c = r.geometry.centroid
+        log_evidence(
+            lat=float(c.y),
+            lon=float(c.x),
+            candidate_id=candidate_id(i + 1),
+            bbox=list(r.geometry.bounds),
+            # Scene IDs live in the GEE evidence lines; keep this id free of S1/ALOS tokens
+            # so make_writeup_stub.py does not mistake file names for scene IDs
+            sources=[DataSource(type="Pipeline inputs (GEE exports)", id=f"data/exports/{px}_*")],
+            notes=f"{px} pipeline hydro-plausibility score",
+            extra={
+                "input_sha256": {Path(k).name: v for k, v in digests.items()},
+                "area_ha": float(r.get("area_ha", float("nan"))),
+                "frac_ok": float(frac.get(i + 1, float("nan"))),
+                "s1_min_db": S1_MIN_DB,
+                "rel_max_m": REL_MAX_M,
+            },
+        )
+    print(f"  logged {len(top)} evidence lines with input digests")
+
+
+def render_overview_fast(r, rank: int, bb, rdA, rdSRGB, rdSDB):
+    """Same panels as the matplotlib overview, composited directly with PIL."""
+    left, lext = None, None
+    if rdA is not None and rdA.count >= 3:
+        w = from_bounds(*bb, transform=rdA.transform)
+        left, lext = stretch_rgb(rdA.read([1, 2, 3], window=w)), window_extent(rdA, w)
+    if rdSRGB is not None and rdSRGB.count >= 3:
+        w = from_bounds(*bb, transform=rdSRGB.transform)
+        right, ext = stretch_rgb(rdSRGB.read([1, 2, 3], window=w)), window_extent(rdSRGB, w)
+        rtitle = "Sentinel-1 VV Δ (RGB)"
+    else:
+        w = from_bounds(*bb, transform=rdSDB.transform)
+        right, ext = colorize_db(rdSDB.read_window(w)), window_extent(rdSDB, w)
+        rtitle = "Sentinel-1 VV Δ (dB)"
+    area = float(r.get("area_ha", float("nan")))
+    return render_overview(
+        left,
+        right,
+        title=f"Candidate rank {rank} (≈{area:.2f} ha)",
+        titles=("ALOS-2 Δ (colorized)" if left is not None else "ALOS-2 Δ", rtitle),
+        extents=(lext, ext),
+    )
+
+
+def step_contact_sheet(top, out_dir: Path, px: str) -> Path:
+    ranks = range(1, len(top) + 1)
+    pngs = [overview_png(out_dir, k) for k in ranks]
+    labels = [f"{candidate_id(k)} · {a:.1f} ha" for k, a in zip(ranks, top["area_ha"])]
+    out = out_dir / f"{px}_contact_sheet.png"
+    contact_sheet(pngs, labels).save(out, compress_level=1)
+    print("  ->", out)
+    return out
+
+
 def step_render_figs(
-    top, alos_rgb: Optional[Path], s1_rgb: Optional[Path], s1_db: Path, buffer_m: int, out_dir: Path
+    top,
+    alos_rgb: Optional[Path],
+    s1_rgb: Optional[Path],
+    s1_db: Path,
+    buffer_m: int,
+    out_dir: Path,
+    ranks: Optional[Iterable[int]] = None,
+    renderer: str = "matplotlib",
 ):
-    print(f"[3/3] Rendering overview PNGs (buffer ≈ {buffer_m} m)")
+    print(f"[3/3] Rendering overview PNGs (buffer ≈ {buffer_m} m, {renderer})")
+    ranks = None if ranks is None else set(ranks)
     out_dir.mkdir(parents=True, exist_ok=True)
     rdA = None
     if alos_rgb and alos_rgb.exists():
@@ -119,10 +367,17 @@ def step_render_figs(
         except Exception:
             rdA = None
     rdSRGB = rasterio.open(s1_rgb) if (s1_rgb and s1_rgb.exists()) else None
-    rdSDB = rasterio.open(s1_db)
+    rdSDB = open_cached(s1_db)
 
     for i, r in top.reset_index(drop=True).iterrows():
+        if ranks is not None and (i + 1) not in ranks:
+            continue
         bb = deg_buffer(r.geometry.bounds, buffer_m)
+        if renderer == "fast":
+            out = overview_png(out_dir, i + 1)
+            render_overview_fast(r, i + 1, bb, rdA, rdSRGB, rdSDB).save(out, compress_level=1)
+            print("  ->", out)
+            continue
         fig, ax = plt.subplots(1, 2, figsize=(8.5, 4.5), dpi=150)
 
         # ALOS-2 RGB (left)
@@ -157,7 +412,7 @@ def step_render_figs(
         if not drawn:
             w = from_bounds(*bb, transform=rdSDB.transform)
             left, rgt, b, t = window_extent(rdSDB, w)
-            s1 = rdSDB.read(1, window=w).astype("float32")
+            s1 = rdSDB.read_window(w)
             ax[1].imshow(
                 np.clip((s1 + 3) / 6, 0, 1), extent=(left, rgt, b, t), cmap="RdBu_r", vmin=0, vmax=1
             )
@@ -169,7 +424,7 @@ def step_render_figs(
         area = float(r.get("area_ha", float("nan")))
         fig.suptitle(f"Candidate rank {i+1} (≈{area:.2f} ha)")
         fig.tight_layout()
-        out = out_dir / f"marajo-hot-01{i+1:02d}_overview.png"
+        out = overview_png(out_dir, i + 1)
         fig.savefig(out, bbox_inches="tight")
         plt.close(fig)
         print("  ->", out)
@@ -178,7 +433,20 @@ def step_render_figs(
         rdA.close()
     if rdSRGB is not None:
         rdSRGB.close()
-    rdSDB.close()
+
+
+def render_keys(top, inputs: dict, buffer_m: int) -> dict:
+    """Per-candidate render key: geometry + rank + shared raster digests + buffer."""
+    keys = {}
+    for i, r in top.reset_index(drop=True).iterrows():
+        keys[i + 1] = stage_key(
+            rank=i + 1,
+            wkb=r.geometry.wkb_hex,
+            area_ha=float(r.get("area_ha", float("nan"))),
+            buffer_m=buffer_m,
+            **inputs,
+        )
+    return keys
 
 
 def main():
@@ -188,7 +456,65 @@ def main():
     )
     ap.add_argument("--topN", type=int, default=5)
     ap.add_argument("--buffer_m", type=int, default=6000)
+    ap.add_argument(
+        "--select-key",
+        type=str,
+        default="area_ha",
+        help="Hotspot property to rank by (area_ha is computed when absent)",
+    )
+    ap.add_argument(
+        "--force", action="store_true", help="Re-run every stage, ignoring the manifest"
+    )
+    ap.add_argument(
+        "--dry-run", action="store_true", help="List the stages that would execute and exit"
+    )
+    ap.add_argument(
+        "--sweep", action="store_true", help="Also write frac_ok for a grid of score thresholds"
+    )
+    ap.add_argument(
+        "--sweep-s1",
+        type=str,
+        default="0:2:0.25",
+        help="S1 Δ dB thresholds, start:stop:step or a,b,c",
+    )
+    ap.add_argument(
+        "--sweep-rel",
+        type=str,
+        default="1:10:1",
+        help="Relief thresholds (m), start:stop:step or a,b,c",
+    )
+    ap.add_argument(
+        "--gedi",
+        type=Path,
+        default=None,
+        help="GEDI points (gedi_wsci_points.csv/.geojson) to join onto the candidates",
+    )
+    ap.add_argument("--gedi-ring-m", type=float, default=1000.0)
+    ap.add_argument(
+        "--tiles", action="store_true", help="Rank AOI tiles with a learned anomaly model"
+    )
+    ap.add_argument("--tile-size", type=int, default=64)
+    ap.add_argument("--tiles-top", type=int, default=10, help="Tiles to print")
+    ap.add_argument(
+        "--multires", action="store_true", help="Coarse-to-fine frac_ok search over AOI tiles"
+    )
+    ap.add_argument("--multires-levels", type=int, default=3)
+    ap.add_argument("--multires-min-frac", type=float, default=0.3)
+    ap.add_argument(
+        "--multires-check", action="store_true", help="Also run exhaustively and print recall"
+    )
+    ap.add_argument(
+        "--renderer",
+        choices=("matplotlib", "fast"),
+        default="matplotlib",
+        help="Overview PNG backend; 'fast' composites arrays with PIL (no matplotlib figure)",
+    )
     args = ap.parse_args()
+    if args.multires and args.tile_size % (2**args.multires_levels):
+        ap.error(
+            f"--tile-size {args.tile_size} must be divisible by 2**--multires-levels "
+            f"({2**args.multires_levels}) for --multires"
+        )
     px = args.prefix
 
     # Inputs expected as data/exports/<prefix>_*
@@ -197,6 +523,7 @@ def main():
     dem30 = EXPORTS / f"{px}_DEM_30m.tif"
     alos_rgb = EXPORTS / f"{px}_ALOS2_delta_rgb.tif"
     s1_rgb = EXPORTS / f"{px}_S1VV_delta_rgb.tif"
+    alos_db = EXPORTS / f"{px}_ALOS2_delta_db.tif"
 
     need(coarse_gj, f"Export from Earth Engine as {px}_S1_hotspots_coarse.geojson")
     need(s1_db, f"Export {px}_S1VV_delta_db.tif")
@@ -205,17 +532,186 @@ def main():
     # Outputs to data/candidates/<prefix>/ and figures/<prefix>/
     cand_dir = CANDS_RT / px
     figs_dir = FIGS_RT / px
+    top_gj = cand_dir / "hotspots_topN.geojson"
+    scores_csv = cand_dir / "hotspots_scores.csv"
+    manifest = Manifest.load(cand_dir / "manifest.json")
+
+    def fresh(name: str, key: str) -> bool:
+        return (not args.force) and manifest.is_fresh(name, key)
+
+    # Hash every input once, in parallel; digests are cached by path/size/mtime
+    inputs_present = [p for p in (coarse_gj, s1_db, dem30, alos_rgb, s1_rgb, alos_db) if p.exists()]
+    if args.gedi:
+        need(args.gedi, "Run scripts/gedi_wsci_extract.py first")
+        inputs_present.append(args.gedi)
+    digests = file_digests(inputs_present)
+
+    def digest_or_none(p: Optional[Path]) -> Optional[str]:
+        return digests.get(str(p)) if p is not None else None
 
-    top = step_select_topN(coarse_gj, args.topN, cand_dir)
-    _ = step_score(top, s1_db=s1_db, dem30=dem30, out_csv=cand_dir / "hotspots_scores.csv")
-    step_render_figs(
-        top,
-        alos_rgb=alos_rgb if alos_rgb.exists() else None,
-        s1_rgb=s1_rgb if s1_rgb.exists() else None,
-        s1_db=s1_db,
-        buffer_m=args.buffer_m,
-        out_dir=figs_dir,
+    s1_digest = digests[str(s1_db)]
+    sel_key = stage_key(coarse=digests[str(coarse_gj)], topN=args.topN, key=args.select_key)
+    run_select = not fresh("select", sel_key)
+
+    if run_select and args.dry_run:
+        # Preview the selection (streamed, cheap) so the keys below say what would really run
+        with tempfile.TemporaryDirectory() as tmp:
+            sel_gj = write_selection(select_frame(coarse_gj, args.topN, args.select_key), Path(tmp))
+            top, top_digest = gpd.read_file(sel_gj), sha256_file(sel_gj)
+    else:
+        if run_select:
+            step_select_topN(coarse_gj, args.topN, cand_dir, key=args.select_key)
+            manifest.record("select", sel_key, [top_gj, cand_dir / "hotspots_topN.csv"])
+            manifest.save()
+        elif not args.dry_run:
+            print(f"[1/3] select: up to date ({top_gj})")
+        # Downstream stages always read the persisted selection so keys match across runs
+        top, top_digest = gpd.read_file(top_gj), file_digest(top_gj)
+
+    score_key = stage_key(
+        top=top_digest,
+        s1_db=s1_digest,
+        dem30=digests[str(dem30)],
+        s1_min_db=S1_MIN_DB,
+        rel_max_m=REL_MAX_M,
     )
+    run_score = not fresh("score", score_key)
+    if args.gedi:
+        gedi_key = stage_key(top=top_digest, gedi=digests[str(args.gedi)], ring_m=args.gedi_ring_m)
+        run_gedi = not fresh("gedi", gedi_key)
+    if args.tiles:
+        tiles_key = stage_key(
+            s1_db=s1_digest,
+            dem30=digests[str(dem30)],
+            alos_db=digest_or_none(alos_db),
+            tile=args.tile_size,
+        )
+        run_tiles = not fresh("tiles", tiles_key)
+    if args.multires:
+        mr_key = stage_key(
+            s1_db=s1_digest,
+            dem30=digests[str(dem30)],
+            tile=args.tile_size,
+            levels=args.multires_levels,
+            min_frac=args.multires_min_frac,
+            s1_min_db=S1_MIN_DB,
+            rel_max_m=REL_MAX_M,
+        )
+        run_mr = args.multires_check or not fresh("multires", mr_key)
+    if args.sweep:
+        s1_thr, rel_thr = parse_grid(args.sweep_s1), parse_grid(args.sweep_rel)
+        sweep_key = stage_key(score=score_key, s1_thr=s1_thr.tolist(), rel_thr=rel_thr.tolist())
+        run_sweep = not fresh("sweep", sweep_key)
+
+    inputs = {
+        "s1_db": s1_digest,
+        "alos_rgb": digest_or_none(alos_rgb),
+        "s1_rgb": digest_or_none(s1_rgb),
+        "renderer": args.renderer,
+    }
+    rkeys = render_keys(top, inputs, args.buffer_m)
+    todo = [rank for rank, k in rkeys.items() if not fresh(f"render/{rank}", k)]
+    sheet_key = stage_key(renders=[rkeys[k] for k in sorted(rkeys)])
+    run_sheet = not fresh("contact_sheet", sheet_key)
+
+    if args.dry_run:
+
+        def show(name: str, run: bool) -> None:
+            print(f"{name + ':':<15}{'run' if run else 'skip'}")
+
+        show("select", run_select)
+        show("score", run_score)
+        if args.sweep:
+            show("sweep", run_sweep)
+        if args.gedi:
+            show("gedi", run_gedi)
+        if args.tiles:
+            show("tiles", run_tiles)
+        if args.multires:
+            show("multires", run_mr)
+        print(f"{'render:':<15}{todo if todo else 'skip'}")
+        show("contact sheet", run_sheet)
+        return
+
+    if run_score:
+        scores = step_score(top, s1_db=s1_db, dem30=dem30, out_csv=scores_csv)
+        log_candidates(
+            top, scores, px, {str(p): digests[str(p)] for p in (coarse_gj, s1_db, dem30)}
+        )
+        manifest.record("score", score_key, [scores_csv])
+        manifest.save()
+    else:
+        print(f"[2/3] score: up to date ({scores_csv})")
+    if args.sweep:
+        sweep_out = [cand_dir / "hotspots_sweep.csv", cand_dir / "hotspots_sweep_summary.csv"]
+        if run_sweep:
+            step_sweep(top, s1_db, dem30, s1_thr, rel_thr, cand_dir)
+            manifest.record("sweep", sweep_key, sweep_out)
+            manifest.save()
+        else:
+            print(f"[2b] sweep: up to date ({sweep_out[0]})")
+    if args.gedi:
+        gedi_csv = cand_dir / "hotspots_gedi.csv"
+        if run_gedi:
+            step_join_gedi(top, args.gedi, args.gedi_ring_m, gedi_csv)
+            manifest.record("gedi", gedi_key, [gedi_csv])
+            manifest.save()
+        else:
+            print(f"[2c] gedi: up to date ({gedi_csv})")
+    if args.tiles:
+        tiles_csv = cand_dir / "tiles_anomaly.csv"
+        if run_tiles:
+            step_tiles(
+                s1_db,
+                dem30,
+                alos_db if alos_db.exists() else None,
+                args.tile_size,
+                args.tiles_top,
+                tiles_csv,
+            )
+            manifest.record("tiles", tiles_key, [tiles_csv])
+            manifest.save()
+        else:
+            print(f"[2d] tiles: up to date ({tiles_csv})")
+    if args.multires:
+        mr_csv = cand_dir / "tiles_multires.csv"
+        if run_mr:
+            step_multires(
+                s1_db,
+                dem30,
+                args.tile_size,
+                args.multires_levels,
+                args.multires_min_frac,
+                args.multires_check,
+                mr_csv,
+            )
+            manifest.record("multires", mr_key, [mr_csv])
+            manifest.save()
+        else:
+            print(f"[2e] multires: up to date ({mr_csv})")
+
+    if todo:
+        step_render_figs(
+            top,
+            alos_rgb=alos_rgb if alos_rgb.exists() else None,
+            s1_rgb=s1_rgb if s1_rgb.exists() else None,
+            s1_db=s1_db,
+            buffer_m=args.buffer_m,
+            out_dir=figs_dir,
+            ranks=todo,
+            renderer=args.renderer,
+        )
+        for rank in todo:
+            manifest.record(f"render/{rank}", rkeys[rank], [overview_png(figs_dir, rank)])
+    else:
+        print(f"[3/3] render: up to date ({figs_dir})")
+    if run_sheet:
+        manifest.record("contact_sheet", sheet_key, [step_contact_sheet(top, figs_dir, px)])
+    # Forget candidates that fell out of the top-N
+    for name in [n for n in manifest.stages if n.startswith("render/")]:
+        if int(name.split("/", 1)[1]) not in rkeys:
+            manifest.drop(name)
+    manifest.save()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Wet−dry seasonal Δ dB from local scene stacks (the GEE export, computed locally).
+
+    python scripts/seasonal_delta.py --prefix santarem --sensor S1VV \
+        --wet "data/scenes/s1/wet/*.tif" --dry "data/scenes/s1/dry/*.tif"
+
+writes data/exports/santarem_S1VV_delta_db.tif, which run_marajo_pipeline.py picks up.
+"""
+
+import argparse
+import glob
+import os
+from pathlib import Path
+
+from zexplorer.compositor import UNITS, seasonal_delta
+
+EXPORTS = Path("data") / "exports"
+# Default input units: S1 GRD stacks are usually exported in dB; ALOS-2 L2.2 ships as DN
+SENSOR_UNITS = {"S1VV": "db", "S1VH": "db", "ALOS2": "dn"}
+
+
+def expand(patterns):
+    out = []
+    for p in patterns:
+        hits = sorted(glob.glob(p)) or [p]
+        out.extend(Path(h) for h in hits)
+    missing = [p for p in out if not p.exists()]
+    if missing:
+        raise SystemExit(f"Missing scenes: {', '.join(map(str, missing))}")
+    return out
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    ap.add_argument("--prefix", required=True, help="AOI prefix, e.g. marajo or santarem")
+    ap.add_argument("--sensor", choices=sorted(SENSOR_UNITS), default="S1VV")
+    ap.add_argument("--wet", nargs="+", required=True, help="Wet-season scenes (paths or globs)")
+    ap.add_argument("--dry", nargs="+", required=True, help="Dry-season scenes (paths or globs)")
+    ap.add_argument("--units", choices=UNITS, default=None, help="Input units (default by sensor)")
+    ap.add_argument("--band", type=int, default=1)
+    ap.add_argument("--block", type=int, default=512, help="Block edge in pixels (multiple of 16)")
+    ap.add_argument("--workers", type=int, default=min(8, os.cpu_count() or 1))
+    ap.add_argument("--min-scenes", type=int, default=1, help="Min valid scenes per season")
+    ap.add_argument("--composites", action="store_true", help="Also write wet/dry median dB")
+    ap.add_argument("--out-dir", default=str(EXPORTS))
+    args = ap.parse_args()
+
+    wet, dry = expand(args.wet), expand(args.dry)
+    units = args.units or SENSOR_UNITS[args.sensor]
+    out = Path(args.out_dir) / f"{args.prefix}_{args.sensor}_delta_db.tif"
+    print(
+        f"Compositing {args.sensor}: {len(wet)} wet × {len(dry)} dry scenes ({units}), "
+        f"block {args.block}, {args.workers} workers"
+    )
+    res = seasonal_delta(
+        wet,
+        dry,
+        out,
+        units=units,
+        band=args.band,
+        block=args.block,
+        workers=args.workers,
+        min_scenes=args.min_scenes,
+        composites=args.composites,
+    )
+    npx = res.shape[0] * res.shape[1]
+    print(
+        f"  {res.shape[1]}×{res.shape[0]} px in {res.blocks} blocks, {res.seconds:.1f}s "
+        f"({npx / max(res.seconds, 1e-9) / 1e6:.1f} Mpx/s); valid {res.valid_px / npx:.1%}"
+    )
+    for p in (res.delta, res.wet, res.dry):
+        if p is not None:
+            print("  ->", p)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,9 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
+import time
+from typing import Dict, List, Sequence, Tuple
+
 import numpy as np
 from skimage.feature import canny
 from skimage.transform import hough_line, hough_line_peaks
@@ -21,3 +25,174 @@ def line_presence_score(img_gray: np.ndarray) -> float:
     h, theta, d = hough_line(edges)
     accums, angles, dists = hough_line_peaks(h, theta, d)
     return float(np.sum(accums)) if accums is not None else 0.0
+
+
+IMAGE_STATS = ("mean", "std", "p90", "edge_density", "line_strength", "texture")
+RELIEF_STATS = ("mean", "std", "range")
+
+
+@dataclass
+class TileScores:
+    origins: np.ndarray  # (n, 2) row/col of each tile's upper-left pixel
+    features: np.ndarray  # (n, F)
+    names: List[str]
+    scores: np.ndarray  # (n,) higher = more anomalous
+    tiles_per_s: float  # scored tiles per second of feature extraction + scoring
+    n_tiles: int = 0  # full tiles in the AOI, including those dropped by min_valid
+
+
+def tile_origins(shape: Tuple[int, int], tile: int) -> np.ndarray:
+    """Upper-left (row, col) of every full tile in a raster of ``shape``."""
+    rows = np.arange(0, shape[0] - tile + 1, tile)
+    cols = np.arange(0, shape[1] - tile + 1, tile)
+    rr, cc = np.meshgrid(rows, cols, indexing="ij")
+    return np.stack([rr.ravel(), cc.ravel()], axis=1)
+
+
+def tile_feature_names(layer_names: Sequence[str]) -> List[str]:
+    names = []
+    for ln in layer_names:
+        stats = RELIEF_STATS if ln == "relief" else IMAGE_STATS
+        names += [f"{ln}_{s}" for s in stats]
+    return names
+
+
+def layer_stretch(
+    layers: Dict[str, np.ndarray], n: int = 200_000, seed: int = 0
+) -> Dict[str, Tuple[float, float]]:
+    """
+    Global p2–p98 per layer from a pixel sample; tiles are scaled with it so edge
+    thresholds mean the same thing in every tile.
+    """
+    rng = np.random.default_rng(seed)
+    out = {}
+    for ln, arr in layers.items():
+        idx = rng.integers(0, arr.size, size=min(n, arr.size))
+        v = np.asarray(arr).reshape(-1)[idx]
+        v = v[np.isfinite(v)]
+        lo, hi = np.percentile(v, [2, 98]) if v.size else (0.0, 1.0)
+        out[ln] = (float(lo), float(hi) if hi > lo else float(lo) + 1.0)
+    return out
+
+
+def _image_stats(t: np.ndarray, lo: float, hi: float) -> List[float]:
+    fin = np.isfinite(t)
+    med = float(np.median(t[fin]))
+    t = np.where(fin, t, med)
+    g = np.clip((t - lo) / (hi - lo), 0.0, 1.0)
+    edges = canny(g, sigma=2.0)
+    if edges.any():
+        # Strongest line per angle, top 5 angles (cheaper than hough_line_peaks per tile)
+        h, _, _ = hough_line(edges)
+        line = float(np.sort(h.max(axis=0))[-5:].sum()) / t.shape[0]
+    else:
+        line = 0.0
+    gy, gx = np.gradient(g)
+    return [
+        float(t.mean()),
+        float(t.std()),
+        float(np.percentile(t, 90)),
+        float(edges.mean()),
+        line,
+        float(np.hypot(gx, gy).mean()),
+    ]
+
+
+def _relief_stats(t: np.ndarray) -> List[float]:
+    v = t[np.isfinite(t)]
+    p5, p95 = np.percentile(v, [5, 95])
+    return [float(v.mean()), float(v.std()), float(p95 - p5)]
+
+
+def tile_features(
+    layers: Dict[str, np.ndarray],
+    origins: np.ndarray,
+    tile: int,
+    stretch: Dict[str, Tuple[float, float]],
+    min_valid: float = 0.5,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Fixed-length feature vector per tile: for image layers (S1 Δ, ALOS-2 Δ) mean/std/p90,
+    Canny edge density, Hough line strength and gradient texture; for ``"relief"``
+    mean/std/p5–p95 range. Tiles with less than ``min_valid`` finite pixels in any layer
+    are dropped; returns ``(features, keep_mask)``.
+    """
+    n_feat = len(tile_feature_names(list(layers)))
+    feats = np.zeros((len(origins), n_feat), dtype="float32")
+    keep = np.ones(len(origins), dtype=bool)
+    for i, (r, c) in enumerate(origins):
+        row: List[float] = []
+        for ln, arr in layers.items():
+            t = np.asarray(arr[r : r + tile, c : c + tile], dtype="float32")
+            if np.isfinite(t).mean() < min_valid:
+                keep[i] = False
+                break
+            row += _relief_stats(t) if ln == "relief" else _image_stats(t, *stretch[ln])
+        if keep[i]:
+            feats[i] = row
+    return feats[keep], keep
+
+
+def score_tiles(
+    layers: Dict[str, np.ndarray],
+    tile: int = 64,
+    sample: int = 2000,
+    batch: int = 1024,
+    seed: int = 0,
+) -> TileScores:
+    """
+    Fit an IsolationForest on features of a random tile sample, then extract and score
+    every tile of the AOI ``batch`` tiles at a time, reusing the sample's features. All
+    layers must share one grid. ``tiles_per_s`` is scored (kept) tiles per second of
+    extraction + scoring, model fit excluded; ``n_tiles`` counts dropped tiles too.
+    """
+    from sklearn.ensemble import IsolationForest
+
+    shape = next(iter(layers.values())).shape
+    origins = tile_origins(shape, tile)
+    stretch = layer_stretch(layers, seed=seed)
+    rng = np.random.default_rng(seed)
+    pick = np.sort(rng.choice(len(origins), size=min(sample, len(origins)), replace=False))
+    t0 = time.perf_counter()
+    fit_x, fit_keep = tile_features(layers, origins[pick], tile, stretch)
+    t_extract = time.perf_counter() - t0
+    if len(fit_x) < 2:
+        raise ValueError("Too few valid tiles to fit the anomaly model")
+    model = IsolationForest(n_estimators=200, random_state=seed).fit(fit_x)
+
+    # Row of each sampled tile in fit_x (-1: sampled but dropped); never re-extracted
+    sampled = np.zeros(len(origins), dtype=bool)
+    sampled[pick] = True
+    cached = np.full(len(origins), -1)
+    cached[pick[fit_keep]] = np.arange(len(fit_x))
+
+    t0 = time.perf_counter()
+    kept_o, kept_f, scores = [], [], []
+    for b in range(0, len(origins), batch):
+        idx = np.arange(b, min(b + batch, len(origins)))
+        new = idx[~sampled[idx]]
+        f_new, keep_new = tile_features(layers, origins[new], tile, stretch)
+        reuse = idx[cached[idx] >= 0]
+        ids = np.concatenate([new[keep_new], reuse])
+        if not len(ids):
+            continue
+        f = np.concatenate([f_new, fit_x[cached[reuse]]])
+        order = np.argsort(ids, kind="stable")
+        ids, f = ids[order], f[order]
+        kept_o.append(origins[ids])
+        kept_f.append(f)
+        scores.append(-model.decision_function(f))
+    dt = t_extract + time.perf_counter() - t0
+    names = tile_feature_names(list(layers))
+    if not scores:
+        empty = np.zeros((0, len(names)), dtype="float32")
+        return TileScores(np.zeros((0, 2), dtype=int), empty, names, np.zeros(0), 0.0, len(origins))
+    n_scored = sum(len(o) for o in kept_o)
+    return TileScores(
+        origins=np.concatenate(kept_o),
+        features=np.concatenate(kept_f),
+        names=names,
+        scores=np.concatenate(scores),
+        tiles_per_s=n_scored / dt if dt > 0 else float("inf"),
+        n_tiles=len(origins),
+    )
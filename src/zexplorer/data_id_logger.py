@@ -1,14 +1,21 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import asdict, dataclass, field
 from datetime import datetime, timezone
 import hashlib
 import json
 import os
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+import time
+from typing import Any, Dict, Iterable, List, Optional
 
 DEFAULT_LOG_PATH = Path("logs/evidence_log.jsonl")
+DEFAULT_DIGEST_CACHE = Path("data/cache/file_digests.json")
+HASH_CHUNK = 4 << 20
+# Files modified this recently are hashed but not cached: a rewrite within the same
+# mtime tick would otherwise keep a stale digest (same trick as git's racy-clean check).
+RACY_WINDOW_S = 2.0
 
 
 def _log_path() -> Path:
@@ -19,10 +26,97 @@ def _log_path() -> Path:
     return DEFAULT_LOG_PATH
 
 
+def _digest_cache_path() -> Path:
+    env_path = os.getenv("ZEXP_DIGEST_CACHE")
+    if env_path:
+        return Path(env_path)
+    return DEFAULT_DIGEST_CACHE
+
+
 def sha256_hex(s: str) -> str:
     return hashlib.sha256(s.encode("utf-8")).hexdigest()
 
 
+def sha256_file(path: Path, chunk_size: int = HASH_CHUNK) -> str:
+    """
+    sha256 of a file's bytes, streamed through one reusable ``chunk_size`` buffer.
+    """
+    h = hashlib.sha256()
+    buf = bytearray(chunk_size)
+    view = memoryview(buf)
+    with Path(path).open("rb", buffering=0) as f:
+        while True:
+            n = f.readinto(buf)
+            if not n:
+                break
+            h.update(view[:n])
+    return h.hexdigest()
+
+
+def file_digests(
+    paths: Iterable[Path], max_workers: int = 4, cache_path: Optional[Path] = None
+) -> Dict[str, str]:
+    """
+    sha256 per input file, keyed by ``str(path)`` as passed in.
+
+    Files are hashed in parallel threads (hashlib releases the GIL on large updates).
+    Digests are cached by resolved path + size + mtime_ns in a JSON file, so unchanged
+    multi-GB exports are not re-read on later runs.
+    """
+    paths = [Path(p) for p in paths]
+    cache_file = Path(cache_path) if cache_path is not None else _digest_cache_path()
+    try:
+        cache = json.loads(cache_file.read_text())
+    except (OSError, json.JSONDecodeError):
+        cache = {}
+
+    # Several spellings of one file share a resolved key; each spelling gets the digest
+    aliases: Dict[str, str] = {str(p): str(p.resolve()) for p in paths}
+    by_key: Dict[str, str] = {}
+    todo: Dict[str, Path] = {}
+    stats: Dict[str, os.stat_result] = {}
+    for p in paths:
+        key = aliases[str(p)]
+        if key in stats:
+            continue
+        st = p.stat()
+        stats[key] = st
+        hit = cache.get(key)
+        if hit and hit.get("size") == st.st_size and hit.get("mtime_ns") == st.st_mtime_ns:
+            by_key[key] = hit["sha256"]
+        else:
+            todo[key] = p
+    if todo:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(todo)))) as ex:
+            by_key.update(zip(todo, ex.map(sha256_file, todo.values())))
+        now = time.time()
+        fresh = {}
+        for key in todo:
+            st = stats[key]
+            if now - st.st_mtime_ns / 1e9 > RACY_WINDOW_S:
+                fresh[key] = {
+                    "size": st.st_size,
+                    "mtime_ns": st.st_mtime_ns,
+                    "sha256": by_key[key],
+                }
+        if fresh:
+            _update_digest_cache(cache_file, fresh)
+    return {name: by_key[key] for name, key in aliases.items()}
+
+
+def _update_digest_cache(cache_file: Path, entries: Dict[str, Dict[str, Any]]) -> None:
+    # Re-read before writing so concurrent runs only lose races, not each other's entries
+    try:
+        cache = json.loads(cache_file.read_text())
+    except (OSError, json.JSONDecodeError):
+        cache = {}
+    cache.update(entries)
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(cache, indent=1, sort_keys=True))
+    tmp.replace(cache_file)
+
+
 @dataclass
 class DataSource:
     type: str
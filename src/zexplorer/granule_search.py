@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import date, timedelta
+import hashlib
+import json
+import os
+from pathlib import Path
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+DEFAULT_CACHE_DIR = Path("data/cache/granule_search")
+DEFAULT_TTL_S = 7 * 24 * 3600
+
+SearchFn = Callable[..., List[Any]]
+
+
+def _cache_dir(cache_dir: Optional[Path] = None) -> Path:
+    # Allow override for tests
+    if cache_dir is not None:
+        return Path(cache_dir)
+    env_path = os.getenv("ZEXP_SEARCH_CACHE")
+    if env_path:
+        return Path(env_path)
+    return DEFAULT_CACHE_DIR
+
+
+@dataclass(frozen=True)
+class GranuleQuery:
+    short_name: str
+    version: str
+    polygon: Tuple[Tuple[float, float], ...]
+    start: str
+    end: str
+    daac: Optional[str] = None
+
+    def key(self) -> str:
+        blob = json.dumps(asdict(self), sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+    def kwargs(self) -> Dict[str, Any]:
+        return {
+            "short_name": self.short_name,
+            "version": self.version,
+            "temporal": (self.start, self.end),
+            "polygon": [list(p) for p in self.polygon],
+            "daac": self.daac,
+        }
+
+
+def _add_months(d: date, months: int) -> date:
+    y, m = divmod(d.month - 1 + months, 12)
+    return date(d.year + y, m + 1, 1)
+
+
+def split_temporal(start: str, end: str, months: int = 12) -> List[Tuple[str, str]]:
+    """
+    Split an inclusive ISO date range into consecutive sub-ranges of ``months`` months,
+    aligned to the first of the month (calendar years when ``start`` is 1 January).
+    """
+    d0, d1 = date.fromisoformat(start[:10]), date.fromisoformat(end[:10])
+    if months <= 0 or d1 < d0:
+        return [(start, end)]
+    out = []
+    cur = d0
+    while cur <= d1:
+        nxt = min(_add_months(cur.replace(day=1), months) - timedelta(days=1), d1)
+        out.append((cur.isoformat(), nxt.isoformat()))
+        cur = nxt + timedelta(days=1)
+    return out
+
+
+class SearchCache:
+    """
+    One JSON file per sub-query under ``cache_dir``; entries older than ``ttl_s`` are stale.
+    Empty results are cached too, so a repeat over a barren AOI stays offline.
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = None, ttl_s: float = DEFAULT_TTL_S):
+        self.root = _cache_dir(cache_dir)
+        self.ttl_s = ttl_s
+
+    def _path(self, q: GranuleQuery) -> Path:
+        return self.root / f"{q.key()}.json"
+
+    def get(self, q: GranuleQuery) -> Optional[List[Dict[str, Any]]]:
+        p = self._path(q)
+        try:
+            body = json.loads(p.read_text())
+        except (OSError, json.JSONDecodeError):
+            return None
+        if time.time() - float(body.get("fetched_at", 0)) > self.ttl_s:
+            return None
+        return body.get("results", [])
+
+    def put(self, q: GranuleQuery, results: List[Dict[str, Any]]) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        p = self._path(q)
+        tmp = p.with_name(f"{p.name}.{os.getpid()}.tmp")
+        body = {"query": asdict(q), "fetched_at": time.time(), "results": results}
+        tmp.write_text(json.dumps(body))
+        tmp.replace(p)
+
+
+def _granule_id(rec: Dict[str, Any]) -> str:
+    meta = rec.get("meta") if isinstance(rec, dict) else None
+    if isinstance(meta, dict) and meta.get("concept-id"):
+        return str(meta["concept-id"])
+    return json.dumps(rec, sort_keys=True, default=str)
+
+
+def concurrent_search(
+    search_fn: SearchFn,
+    candidates: Sequence[GranuleQuery],
+    months: int = 12,
+    cache: Optional[SearchCache] = None,
+    encode: Callable[[Any], Dict[str, Any]] = dict,
+    decode: Callable[[Dict[str, Any]], Any] = lambda d: d,
+    max_workers: int = 8,
+) -> Tuple[int, List[Any]]:
+    """
+    Run every candidate query, each split into temporal sub-ranges, at the same time.
+
+    Returns ``(i, results)`` for the first candidate in priority order that completed
+    without error and found granules, else ``(-1, [])``. Sub-range results are merged in
+    time order and de-duplicated by CMR concept-id. If the cache alone settles the answer
+    (a fully cached, non-empty candidate with every higher-priority candidate fully cached)
+    ``search_fn`` is never called; otherwise only uncached sub-queries go out. Failed
+    sub-queries are never cached.
+    """
+    cache = cache if cache is not None else SearchCache()
+    plan = [
+        [
+            GranuleQuery(**{**asdict(c), "start": s, "end": e})
+            for s, e in split_temporal(c.start, c.end, months)
+        ]
+        for c in candidates
+    ]
+
+    def run(q: GranuleQuery) -> Optional[List[Dict[str, Any]]]:
+        try:
+            res = [encode(r) for r in (search_fn(**q.kwargs()) or [])]
+        except Exception as e:
+            print(f"Search error (daac={q.daac}, {q.start}..{q.end}): {e}")
+            return None
+        cache.put(q, res)
+        return res
+
+    got: Dict[GranuleQuery, Optional[List[Dict[str, Any]]]] = {
+        q: cache.get(q) for sub in plan for q in sub
+    }
+    # Priority walk over the cache first; stop at the first candidate with a gap
+    for i, sub in enumerate(plan):
+        parts = [got[q] for q in sub]
+        if any(p is None for p in parts):
+            break
+        merged = _merge(parts)
+        if merged:
+            return i, [decode(r) for r in merged]
+
+    todo = [q for q, res in got.items() if res is None]
+    if todo:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(todo)))) as ex:
+            for q, res in zip(todo, ex.map(run, todo)):
+                got[q] = res
+
+    for i, sub in enumerate(plan):
+        parts = [got[q] for q in sub]
+        if any(p is None for p in parts):
+            continue
+        merged = _merge(parts)
+        if merged:
+            return i, [decode(r) for r in merged]
+    return -1, []
+
+
+def _merge(parts: List[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    seen, merged = set(), []
+    for part in parts:
+        for rec in part:
+            gid = _granule_id(rec)
+            if gid not in seen:
+                seen.add(gid)
+                merged.append(rec)
+    return merged
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass, field
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from zexplorer.data_id_logger import file_digests
+
+
+def file_digest(path: Path) -> str:
+    """
+    sha256 of a file's bytes (streamed; cached by path/size/mtime).
+    """
+    return file_digests([path])[str(path)]
+
+
+def stage_key(**parts: Any) -> str:
+    """
+    Stable hash of a stage's inputs/parameters (JSON-serialisable values, key order ignored).
+    """
+    blob = json.dumps(parts, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class StageEntry:
+    key: str
+    outputs: List[str] = field(default_factory=list)
+
+
+@dataclass
+class Manifest:
+    """
+    Record of the input hash behind each pipeline artifact.
+
+    Entries are named ``"select"``, ``"score"`` or ``"render/<rank>"``; an entry is
+    fresh when its key matches and every recorded output still exists on disk.
+    """
+
+    path: Path
+    stages: Dict[str, StageEntry] = field(default_factory=dict)
+
+    @classmethod
+    def load(cls, path: Path) -> "Manifest":
+        path = Path(path)
+        if not path.exists():
+            return cls(path=path)
+        try:
+            raw = json.loads(path.read_text())
+        except json.JSONDecodeError:
+            return cls(path=path)
+        stages = {name: StageEntry(**e) for name, e in raw.get("stages", {}).items()}
+        return cls(path=path, stages=stages)
+
+    def is_fresh(self, name: str, key: str) -> bool:
+        e = self.stages.get(name)
+        if e is None or e.key != key:
+            return False
+        return all(Path(p).exists() for p in e.outputs)
+
+    def record(self, name: str, key: str, outputs: Iterable[Path]) -> None:
+        self.stages[name] = StageEntry(key=key, outputs=[str(p) for p in outputs])
+
+    def drop(self, name: str) -> Optional[StageEntry]:
+        return self.stages.pop(name, None)
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        body = {"stages": {k: asdict(v) for k, v in sorted(self.stages.items())}}
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        tmp.write_text(json.dumps(body, indent=2))
+        tmp.replace(self.path)
@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+RELIEF_SIGMA = 5.0  # px; the pipeline's local-relief Gaussian
+TRUNCATE = 4.0  # skimage/scipy default kernel radius in sigmas
+
+
+@dataclass
+class SearchResult:
+    origins: np.ndarray  # (n, 2) row/col of detected native tiles
+    scores: np.ndarray  # (n,) frac_ok at native resolution
+    evaluated_px: int  # pixels on which the hydro rule was evaluated
+    total_px: int  # pixels an exhaustive native pass evaluates
+    levels: List[Tuple[int, int, int]] = field(default_factory=list)  # (step, tiles, kept)
+    relief_px: int = 0  # DEM samples Gaussian-filtered to derive relief (halos included)
+    relief_total_px: int = 0  # DEM pixels the full-resolution relief pass filters
+
+    @property
+    def compute_saved(self) -> float:
+        """Share of rule + relief pixel work skipped relative to an exhaustive run."""
+        total = self.total_px + self.relief_total_px
+        done = self.evaluated_px + self.relief_px
+        return 1.0 - done / total if total else 0.0
+
+
+def local_relief(dem: np.ndarray, sigma: float = RELIEF_SIGMA) -> np.ndarray:
+    """
+    DEM minus its Gaussian blur (``sigma`` px); non-finite results are NaN.
+    """
+    from skimage.filters import gaussian
+
+    dem = np.asarray(dem, dtype="float32")
+    rel = dem - gaussian(dem, sigma=sigma, preserve_range=True, truncate=TRUNCATE)
+    rel[~np.isfinite(rel)] = np.nan
+    return rel
+
+
+def _block_relief(
+    dem: np.ndarray, r0: int, r1: int, c0: int, c1: int, step: int, sigma: float
+) -> Tuple[np.ndarray, int]:
+    # Relief at every step-th pixel of rows r0:r1, cols c0:c1, filtered on the strided DEM
+    # with sigma/step plus a kernel-radius halo. At step 1 this equals local_relief(dem)
+    # cropped to the block; coarser steps are an estimate used only for pruning.
+    hs = int(TRUNCATE * sigma / step + 0.5)
+    a0, b0 = max(r0 - hs * step, 0), max(c0 - hs * step, 0)
+    a1, b1 = min(r1 + hs * step, dem.shape[0]), min(c1 + hs * step, dem.shape[1])
+    sub = np.asarray(dem[a0:a1:step, b0:b1:step])
+    rel = local_relief(sub, sigma / step)
+    i0, j0 = (r0 - a0) // step, (c0 - b0) // step
+    return rel[i0 : i0 + -(-(r1 - r0) // step), j0 : j0 + -(-(c1 - c0) // step)], sub.size
+
+
+def _ok(s1: np.ndarray, rel: np.ndarray, s1_min: float, rel_max: float) -> np.ndarray:
+    # NaN compares False, so non-finite pixels count against frac_ok as in step_score
+    return (s1 > s1_min) & (rel <= rel_max)
+
+
+def _check_relief_args(rel: Optional[np.ndarray], dem: Optional[np.ndarray]) -> None:
+    if (rel is None) == (dem is None):
+        raise ValueError("pass exactly one of rel (precomputed relief) or dem")
+
+
+def exhaustive(
+    s1: np.ndarray,
+    rel: Optional[np.ndarray] = None,
+    tile: int = 64,
+    min_frac: float = 0.3,
+    s1_min: float = 0.5,
+    rel_max: float = 5.0,
+    dem: Optional[np.ndarray] = None,
+    sigma: float = RELIEF_SIGMA,
+) -> SearchResult:
+    """
+    Native-resolution frac_ok of every full ``tile``×``tile`` tile; keeps ``>= min_frac``.
+    Relief is ``rel`` or, from ``dem``, one full-resolution ``local_relief`` pass.
+    """
+    _check_relief_args(rel, dem)
+    if rel is None:
+        rel = local_relief(dem, sigma)
+    nr, nc = s1.shape[0] // tile, s1.shape[1] // tile
+    h, w = nr * tile, nc * tile
+    ok = _ok(np.asarray(s1[:h, :w]), np.asarray(rel[:h, :w]), s1_min, rel_max)
+    frac = ok.reshape(nr, tile, nc, tile).mean(axis=(1, 3))
+    rr, cc = np.nonzero(frac >= min_frac)
+    return SearchResult(
+        origins=np.stack([rr * tile, cc * tile], axis=1),
+        scores=frac[rr, cc],
+        evaluated_px=h * w,
+        total_px=h * w,
+        levels=[(1, nr * nc, len(rr))],
+        relief_px=rel.size,
+        relief_total_px=rel.size,
+    )
+
+
+def coarse_to_fine(
+    s1: np.ndarray,
+    rel: Optional[np.ndarray] = None,
+    tile: int = 64,
+    levels: int = 3,
+    min_frac: float = 0.3,
+    prune: float = 0.5,
+    s1_min: float = 0.5,
+    rel_max: float = 5.0,
+    dem: Optional[np.ndarray] = None,
+    sigma: float = RELIEF_SIGMA,
+) -> SearchResult:
+    """
+    Quadtree search for native tiles with frac_ok ``>= min_frac``.
+
+    Level ``k`` (``levels`` … 1) looks at blocks of ``tile·2^k`` pixels through every
+    ``2^k``-th pixel (strided views, nothing is resampled), so each block costs
+    ``tile²`` samples. The samples are also grouped per native tile, which gives a
+    ``(tile/2^k)²``-sample estimate of every native tile's frac_ok for free. Each of the
+    block's four quadrants goes on to the next level only if one of its native tiles
+    estimates ``>= prune·min_frac``. Level 0 is the exact native pass over survivors.
+
+    Pass ``dem`` (on the S1 grid) instead of a precomputed ``rel`` to derive relief lazily:
+    each block's relief comes from its strided DEM samples plus a Gaussian halo, so pruned
+    areas are never filtered at full resolution and level-0 relief matches
+    ``local_relief(dem)`` exactly. ``relief_px`` counts the DEM samples filtered.
+    """
+    _check_relief_args(rel, dem)
+    if tile % (2**levels):
+        raise ValueError(f"tile={tile} must be divisible by 2**levels={2**levels}")
+    nr, nc = s1.shape[0] // tile, s1.shape[1] // tile
+    h, w = nr * tile, nc * tile
+    keep_at = prune * min_frac
+    evaluated = 0
+    relief_px = 0
+    stats: List[Tuple[int, int, int]] = []
+
+    # Blocks in units of native tiles: (row, col) of the block's top-left native tile
+    span = 2**levels
+    cand = [(r, c) for r in range(0, nr, span) for c in range(0, nc, span)]
+    kept, scores = [], []
+    for k in range(levels, -1, -1):
+        step, span = 2**k, 2**k
+        m = tile // step  # samples per native tile side at this level
+        nxt: List[Tuple[int, int]] = []
+        for r, c in cand:
+            tr, tc = min(span, nr - r), min(span, nc - c)
+            r0, r1, c0, c1 = r * tile, (r + tr) * tile, c * tile, (c + tc) * tile
+            a = np.asarray(s1[r0:r1:step, c0:c1:step])
+            if dem is None:
+                b = np.asarray(rel[r0:r1:step, c0:c1:step])
+            else:
+                b, n = _block_relief(dem, r0, r1, c0, c1, step, sigma)
+                relief_px += n
+            evaluated += a.size
+            sub = _ok(a, b, s1_min, rel_max).reshape(tr, m, tc, m).mean(axis=(1, 3))
+            if k == 0:
+                if sub[0, 0] >= min_frac:
+                    kept.append((r, c))
+                    scores.append(float(sub[0, 0]))
+                continue
+            half = span // 2
+            for dr in (0, half):
+                for dc in (0, half):
+                    q = sub[dr : dr + half, dc : dc + half]
+                    if q.size and q.max() >= keep_at:
+                        nxt.append((r + dr, c + dc))
+        stats.append((step, len(cand), len(kept) if k == 0 else len(nxt)))
+        cand = nxt
+
+    origins = np.array([(r * tile, c * tile) for r, c in kept], dtype=int).reshape(-1, 2)
+    return SearchResult(
+        origins=origins,
+        scores=np.asarray(scores, dtype="float64"),
+        evaluated_px=evaluated,
+        total_px=h * w,
+        levels=stats,
+        # A precomputed rel already cost one full-resolution pass
+        relief_px=rel.size if dem is None else relief_px,
+        relief_total_px=rel.size if dem is None else dem.size,
+    )
+
+
+def recall(found: SearchResult, truth: SearchResult) -> float:
+    """Share of ``truth`` tiles that ``found`` also reports (1.0 when truth is empty)."""
+    t = {tuple(o) for o in truth.origins}
+    if not t:
+        return 1.0
+    return len(t & {tuple(o) for o in found.origins}) / len(t)
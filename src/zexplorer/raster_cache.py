@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+DEFAULT_CACHE_DIR = Path("data/cache/rasters")
+
+
+def _cache_dir(cache_dir: Optional[Path] = None) -> Path:
+    # Allow override for tests and multi-AOI runs sharing one cache
+    if cache_dir is not None:
+        return Path(cache_dir)
+    env_path = os.getenv("ZEXP_RASTER_CACHE")
+    if env_path:
+        return Path(env_path)
+    return DEFAULT_CACHE_DIR
+
+
+def source_fingerprint(src: Path) -> Dict[str, int]:
+    """
+    Cheap change detector for a source file: size + mtime (ns).
+    """
+    st = Path(src).stat()
+    return {"size": int(st.st_size), "mtime_ns": int(st.st_mtime_ns)}
+
+
+def _cache_key(src: Path, band: int, dtype: str) -> str:
+    ident = f"{Path(src).resolve()}|band={band}|dtype={np.dtype(dtype).str}"
+    return hashlib.sha256(ident.encode("utf-8")).hexdigest()[:32]
+
+
+@dataclass
+class CachedRaster:
+    """
+    Decoded single band backed by a read-only ``np.memmap`` plus georeferencing.
+
+    ``transform`` is an ``affine.Affine`` and ``crs`` a ``rasterio.crs.CRS`` so the
+    object can stand in for an open dataset in transform/window helpers.
+    """
+
+    path: Path
+    array: np.ndarray
+    transform: Any
+    crs: Any
+    nodata: Optional[float] = None
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return tuple(self.array.shape)
+
+    def read_window(self, win) -> np.ndarray:
+        """
+        Zero-copy view for a ``rasterio.windows.Window`` (rounded, clipped to the array).
+        """
+        r0 = max(int(round(win.row_off)), 0)
+        c0 = max(int(round(win.col_off)), 0)
+        r1 = min(int(round(win.row_off + win.height)), self.array.shape[0])
+        c1 = min(int(round(win.col_off + win.width)), self.array.shape[1])
+        return self.array[r0 : max(r0, r1), c0 : max(c0, c1)]
+
+
+def _load(meta_path: Path, data_path: Path, src: Path) -> CachedRaster:
+    from affine import Affine
+    from rasterio.crs import CRS
+
+    meta = json.loads(meta_path.read_text())
+    arr = np.load(data_path, mmap_mode="r")
+    crs = CRS.from_wkt(meta["crs"]) if meta.get("crs") else None
+    return CachedRaster(
+        path=Path(src),
+        array=arr,
+        transform=Affine(*meta["transform"]),
+        crs=crs,
+        nodata=meta.get("nodata"),
+    )
+
+
+def _decode(src: Path, band: int, dtype: str, data_path: Path) -> Dict[str, Any]:
+    import rasterio
+
+    tmp = data_path.with_name(f"{data_path.name}.{os.getpid()}.tmp")
+    with rasterio.open(src) as ds:
+        out = np.lib.format.open_memmap(tmp, mode="w+", dtype=dtype, shape=(ds.height, ds.width))
+        # Decode block by block so peak memory stays at one block, not one raster
+        for _, win in ds.block_windows(band):
+            rs = slice(win.row_off, win.row_off + win.height)
+            cs = slice(win.col_off, win.col_off + win.width)
+            out[rs, cs] = ds.read(band, window=win).astype(dtype, copy=False)
+        out.flush()
+        del out
+        meta = {
+            "transform": [
+                ds.transform.a,
+                ds.transform.b,
+                ds.transform.c,
+                ds.transform.d,
+                ds.transform.e,
+                ds.transform.f,
+            ],
+            "crs": ds.crs.to_wkt() if ds.crs else None,
+            "nodata": ds.nodata,
+            "shape": [ds.height, ds.width],
+        }
+    os.replace(tmp, data_path)
+    return meta
+
+
+def open_cached(
+    src: Path,
+    band: int = 1,
+    dtype: str = "float32",
+    cache_dir: Optional[Path] = None,
+) -> CachedRaster:
+    """
+    Return a memory-mapped view of ``band`` of GeoTIFF ``src``, decoding it at most once.
+
+    The decoded array lives in ``<cache_dir>/<key>.npy`` next to a ``<key>.json`` sidecar
+    holding transform/CRS/nodata and the source fingerprint. A changed source (size or
+    mtime) triggers a re-decode. Files are swapped in with ``os.replace`` so readers in
+    other processes keep a valid mapping while a rebuild happens.
+    """
+    src = Path(src)
+    root = _cache_dir(cache_dir)
+    root.mkdir(parents=True, exist_ok=True)
+    key = _cache_key(src, band, dtype)
+    data_path = root / f"{key}.npy"
+    meta_path = root / f"{key}.json"
+    fp = source_fingerprint(src)
+
+    if meta_path.exists() and data_path.exists():
+        try:
+            meta = json.loads(meta_path.read_text())
+        except (OSError, json.JSONDecodeError):
+            meta = {}
+        if meta.get("source") == fp and meta.get("dtype") == np.dtype(dtype).str:
+            return _load(meta_path, data_path, src)
+
+    meta = _decode(src, band, dtype, data_path)
+    meta.update({"source": fp, "src_path": str(src), "band": band, "dtype": np.dtype(dtype).str})
+    tmp = meta_path.with_name(f"{meta_path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(meta))
+    os.replace(tmp, meta_path)
+    return _load(meta_path, data_path, src)
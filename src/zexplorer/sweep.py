@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+
+def parse_grid(spec: str) -> np.ndarray:
+    """
+    ``"start:stop:step"`` (inclusive stop) or comma list ``"0.5,1,1.5"`` → sorted thresholds.
+    """
+    if ":" in spec:
+        start, stop, step = (float(x) for x in spec.split(":"))
+        n = int(np.floor((stop - start) / step + 1e-9)) + 1
+        vals = start + step * np.arange(n)
+    else:
+        vals = np.array([float(x) for x in spec.split(",") if x.strip()])
+    return np.unique(np.round(vals, 10))
+
+
+def joint_histogram(
+    s1: np.ndarray, rel: np.ndarray, s1_thr: np.ndarray, rel_thr: np.ndarray
+) -> np.ndarray:
+    """
+    2-D histogram of (S1 Δ dB, local relief) binned *at the thresholds themselves*.
+
+    Bin ``a`` on the S1 axis holds pixels with exactly ``a`` thresholds strictly below
+    them, so ``s1 > s1_thr[j]`` ⇔ ``a > j``; bin ``b`` on the relief axis holds pixels
+    with ``b`` thresholds strictly below, so ``rel <= rel_thr[k]`` ⇔ ``b <= k``.
+    Non-finite pixels are dropped. Shape: ``(len(s1_thr) + 1, len(rel_thr) + 1)``.
+    """
+    s1 = np.asarray(s1, dtype="float32").ravel()
+    rel = np.asarray(rel, dtype="float32").ravel()
+    ok = np.isfinite(s1) & np.isfinite(rel)
+    a = np.searchsorted(s1_thr, s1[ok], side="left")
+    b = np.searchsorted(rel_thr, rel[ok], side="left")
+    nb = len(rel_thr) + 1
+    flat = np.bincount(a * nb + b, minlength=(len(s1_thr) + 1) * nb)
+    return flat.reshape(len(s1_thr) + 1, nb)
+
+
+def ok_counts(hist: np.ndarray) -> np.ndarray:
+    """
+    Pixels passing ``s1 > s1_thr[j] & rel <= rel_thr[k]`` for every (j, k).
+
+    Suffix-sum over the S1 axis, prefix-sum over the relief axis: O(grid), no re-scan.
+    """
+    suffix = np.cumsum(hist[::-1], axis=0)[::-1]
+    both = np.cumsum(suffix, axis=1)
+    return both[1:, :-1]
+
+
+def frac_ok_grid(hists: np.ndarray, pix: np.ndarray) -> np.ndarray:
+    """
+    ``(n_cand, n_s1, n_rel)`` fraction of candidate pixels passing each threshold pair.
+    """
+    counts = np.stack([ok_counts(h) for h in hists]) if len(hists) else np.zeros((0, 0, 0))
+    denom = np.asarray(pix, dtype="float64")[:, None, None]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(denom > 0, counts / np.maximum(denom, 1), 0.0)
+
+
+def _rank(x: np.ndarray) -> np.ndarray:
+    order = np.argsort(-x, kind="stable")
+    r = np.empty(len(x), dtype="float64")
+    r[order] = np.arange(len(x))
+    return r
+
+
+def sensitivity_rows(
+    frac: np.ndarray,
+    idx: Sequence[int],
+    s1_thr: np.ndarray,
+    rel_thr: np.ndarray,
+    baseline: tuple,
+) -> List[Dict[str, float]]:
+    """
+    One row per threshold pair: spread of ``frac_ok`` across candidates, the top candidate,
+    and Spearman rank agreement with the candidate ordering at ``baseline``.
+    """
+    idx = np.asarray(idx)
+    j0 = int(np.argmin(np.abs(s1_thr - baseline[0])))
+    k0 = int(np.argmin(np.abs(rel_thr - baseline[1])))
+    base_rank = _rank(frac[:, j0, k0]) if len(idx) else np.zeros(0)
+    rows = []
+    for j, t_s1 in enumerate(s1_thr):
+        for k, t_rel in enumerate(rel_thr):
+            f = frac[:, j, k]
+            if len(idx) > 1:
+                rho = float(np.corrcoef(_rank(f), base_rank)[0, 1])
+            else:
+                rho = float("nan")
+            rows.append(
+                {
+                    "s1_min_db": float(t_s1),
+                    "rel_max_m": float(t_rel),
+                    "mean_frac_ok": float(f.mean()) if len(f) else float("nan"),
+                    "max_frac_ok": float(f.max()) if len(f) else float("nan"),
+                    "top_idx": int(idx[int(np.argmax(f))]) if len(f) else -1,
+                    "spearman_vs_baseline": rho,
+                }
+            )
+    return rows
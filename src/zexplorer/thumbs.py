@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+# ColorBrewer RdBu (11 classes), reversed so positive Δ dB is red, as cmap="RdBu_r"
+_RDBU_R = np.array(
+    [
+        (5, 48, 97),
+        (33, 102, 172),
+        (67, 147, 195),
+        (146, 197, 222),
+        (209, 229, 240),
+        (247, 247, 247),
+        (253, 219, 199),
+        (244, 165, 130),
+        (214, 96, 77),
+        (178, 24, 43),
+        (103, 0, 31),
+    ],
+    dtype="float32",
+)
+_x = np.linspace(0.0, 1.0, len(_RDBU_R))
+RDBU_R_LUT = np.stack(
+    [np.interp(np.linspace(0.0, 1.0, 256), _x, _RDBU_R[:, k]) for k in range(3)], axis=1
+).astype("uint8")
+
+Extent = Tuple[float, float, float, float]
+
+BG = (255, 255, 255)
+FG = (20, 20, 20)
+
+
+def stretch_rgb(bands: np.ndarray) -> np.ndarray:
+    """
+    (3, H, W) → (H, W, 3) uint8 with the overview's p99 stretch.
+    """
+    a = np.asarray(bands, dtype="float32")
+    a = np.clip(a / (np.nanpercentile(a, 99) + 1e-6), 0, 1)
+    a = np.nan_to_num(a, nan=1.0)
+    return (np.transpose(a, (1, 2, 0)) * 255.0 + 0.5).astype("uint8")
+
+
+def colorize_db(db: np.ndarray, vmin: float = -3.0, vmax: float = 3.0) -> np.ndarray:
+    """
+    Δ dB → (H, W, 3) uint8 through a 256-entry RdBu_r lookup table; NaN is white.
+    """
+    d = np.asarray(db, dtype="float32")
+    idx = np.clip((d - vmin) / (vmax - vmin), 0, 1)
+    idx = np.nan_to_num(idx, nan=0.5)
+    rgb = RDBU_R_LUT[(idx * 255.0 + 0.5).astype("uint8")]
+    rgb[~np.isfinite(d)] = BG
+    return rgb
+
+
+def _fit(img: np.ndarray, box: Tuple[int, int]) -> Image.Image:
+    # Letterbox into `box` (w, h) keeping aspect; nearest keeps pixels crisp and is cheapest
+    im = Image.fromarray(img)
+    w, h = im.size
+    s = min(box[0] / max(w, 1), box[1] / max(h, 1))
+    im = im.resize((max(1, int(w * s)), max(1, int(h * s))), Image.NEAREST)
+    out = Image.new("RGB", box, BG)
+    out.paste(im, ((box[0] - im.size[0]) // 2, (box[1] - im.size[1]) // 2))
+    return out
+
+
+@lru_cache(maxsize=1)
+def _font() -> ImageFont.ImageFont:
+    # DejaVu Sans ships with matplotlib (same face as the matplotlib overviews) and has Δ/≈
+    try:
+        import matplotlib
+
+        ttf = Path(matplotlib.get_data_path()) / "fonts" / "ttf" / "DejaVuSans.ttf"
+        return ImageFont.truetype(str(ttf), 14)
+    except (ImportError, OSError):
+        pass
+    try:
+        return ImageFont.load_default(size=14)
+    except TypeError:  # Pillow < 10.1 has no sized default font
+        return ImageFont.load_default()
+
+
+def render_overview(
+    left: Optional[np.ndarray],
+    right: np.ndarray,
+    title: str,
+    titles: Tuple[str, str],
+    extents: Tuple[Optional[Extent], Optional[Extent]] = (None, None),
+    panel: int = 560,
+) -> Image.Image:
+    """
+    Two stretched panels side by side with a title strip, panel titles and each panel's
+    own lon/lat extent (left, right, bottom, top) as corner labels. ``left=None`` draws
+    the "not available" placeholder, mirroring the matplotlib overview.
+    """
+    pad, head, sub = 12, 34, 22
+    W = 2 * panel + 3 * pad
+    H = head + sub + panel + (22 if any(extents) else pad)
+    canvas = Image.new("RGB", (W, H), BG)
+    draw = ImageDraw.Draw(canvas)
+    font = _font()
+    draw.text((W // 2, head // 2), title, fill=FG, font=font, anchor="mm")
+    for k, (img, t, extent) in enumerate(zip((left, right), titles, extents)):
+        x0 = pad + k * (panel + pad)
+        y0 = head + sub
+        draw.text((x0 + panel // 2, head + sub // 2), t, fill=FG, font=font, anchor="mm")
+        if img is None:
+            draw.rectangle([x0, y0, x0 + panel - 1, y0 + panel - 1], outline=FG)
+            msg = f"{t} not available"
+            draw.text((x0 + panel // 2, y0 + panel // 2), msg, fill=FG, font=font, anchor="mm")
+        else:
+            canvas.paste(_fit(img, (panel, panel)), (x0, y0))
+        if extent:
+            lft, rgt, bot, top = extent
+            yb = y0 + panel + 4
+            draw.text((x0, yb), f"{lft:.3f}, {bot:.3f}", fill=FG, font=font)
+            draw.text((x0 + panel, yb), f"{rgt:.3f}, {top:.3f}", fill=FG, font=font, anchor="ra")
+    return canvas
+
+
+def contact_sheet(
+    paths: Sequence[Path],
+    labels: Optional[Sequence[str]] = None,
+    cols: int = 4,
+    cell: int = 480,
+) -> Image.Image:
+    """
+    Tile already-rendered PNGs into one sheet (``cell`` px wide per column, label above).
+    Each image is downscaled with ``thumbnail`` before pasting.
+    """
+    labels = list(labels) if labels is not None else [Path(p).stem for p in paths]
+    thumbs: List[Image.Image] = []
+    for p in paths:
+        im = Image.open(p).convert("RGB")
+        im.thumbnail((cell, cell), Image.BILINEAR)
+        thumbs.append(im)
+    cols = max(1, min(cols, len(thumbs) or 1))
+    rows = (len(thumbs) + cols - 1) // cols
+    lab = 20
+    ch = max((t.size[1] for t in thumbs), default=cell) + lab
+    sheet = Image.new("RGB", (cols * cell, max(rows, 1) * ch), BG)
+    draw = ImageDraw.Draw(sheet)
+    font = _font()
+    for i, (t, name) in enumerate(zip(thumbs, labels)):
+        x, y = (i % cols) * cell, (i // cols) * ch
+        draw.text((x + cell // 2, y + lab // 2), name, fill=FG, font=font, anchor="mm")
+        sheet.paste(t, (x + (cell - t.size[0]) // 2, y + lab))
+    return sheet
@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+import heapq
+import json
+import math
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+
+EQUAL_AREA_CRS = "EPSG:6933"  # WGS 84 / NSIDC EASE-Grid 2.0 Global (cylindrical equal-area)
+_WS = " \t\n\r"
+
+
+class _JsonStream:
+    """
+    Minimal pull parser over a text file: decode one JSON value at a time with bounded
+    buffering, so a FeatureCollection is never materialised in full.
+    """
+
+    def __init__(self, f, chunk_size: int):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+        self.dec = json.JSONDecoder()
+
+    def _fill(self) -> bool:
+        if self.eof:
+            return False
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        # Drop consumed text so the buffer stays about one value + one chunk long
+        self.buf = self.buf[self.pos :] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WS:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, ch: str) -> None:
+        got = self.peek()
+        if got != ch:
+            raise ValueError(f"Malformed GeoJSON: expected {ch!r}, got {got!r}")
+        self.pos += 1
+
+    def value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                obj, end = self.dec.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # A number/literal ending exactly at the buffer edge may be truncated
+            if end == len(self.buf) and not self.eof and self._fill():
+                continue
+            self.pos = end
+            return obj
+
+
+def iter_geojson_features(path: Path, chunk_size: int = 1 << 20) -> Iterator[Dict[str, Any]]:
+    """
+    Yield the features of a GeoJSON FeatureCollection one at a time (top-level member
+    order does not matter; non-``features`` members are skipped).
+    """
+    with Path(path).open("r", encoding="utf-8") as f:
+        js = _JsonStream(f, chunk_size)
+        js.expect("{")
+        if js.peek() == "}":
+            return
+        while True:
+            key = js.value()
+            js.expect(":")
+            if key == "features":
+                js.expect("[")
+                if js.peek() == "]":
+                    js.pos += 1
+                else:
+                    while True:
+                        yield js.value()
+                        if js.peek() == ",":
+                            js.pos += 1
+                            continue
+                        js.expect("]")
+                        break
+            else:
+                js.value()
+            if js.peek() == ",":
+                js.pos += 1
+                continue
+            js.expect("}")
+            return
+
+
+def _polygons(geom: Optional[Dict[str, Any]]) -> List[list]:
+    if not geom:
+        return []
+    t = geom.get("type")
+    if t == "Polygon":
+        return [geom["coordinates"]]
+    if t == "MultiPolygon":
+        return list(geom["coordinates"])
+    if t == "GeometryCollection":
+        return [p for g in geom.get("geometries", []) for p in _polygons(g)]
+    return []
+
+
+def equal_area_ha(geoms: List[Optional[Dict[str, Any]]], transformer) -> np.ndarray:
+    """
+    Areas (ha) of GeoJSON geometry dicts, projected to an equal-area CRS in one batch.
+
+    All ring vertices are transformed in a single vectorised call and the shoelace sums
+    are reduced per ring with ``np.add.reduceat``; holes are subtracted.
+    """
+    coords: list = []
+    starts, sign, owner = [], [], []
+    for fi, g in enumerate(geoms):
+        for poly in _polygons(g):
+            for ri, ring in enumerate(poly):
+                if len(ring) < 3:
+                    continue
+                starts.append(len(coords))
+                sign.append(1.0 if ri == 0 else -1.0)
+                owner.append(fi)
+                coords.extend(ring)
+                if ring[0] != ring[-1]:
+                    coords.append(ring[0])
+    out = np.zeros(len(geoms), dtype="float64")
+    if not starts:
+        return out
+    n = len(coords)
+    xy = np.asarray([c[:2] for c in coords] if any(len(c) > 2 for c in coords) else coords)
+    x, y = transformer.transform(xy[:, 0].astype("float64"), xy[:, 1].astype("float64"))
+    x, y = np.asarray(x), np.asarray(y)
+    cross = np.zeros(n, dtype="float64")
+    cross[:-1] = x[:-1] * y[1:] - x[1:] * y[:-1]
+    # The pair straddling two rings is not an edge
+    cross[np.asarray(starts[1:], dtype="int64") - 1] = 0.0
+    ring_area = np.abs(np.add.reduceat(cross, np.asarray(starts, dtype="int64"))) / 2.0
+    np.add.at(out, np.asarray(owner), np.asarray(sign) * ring_area)
+    return out / 10_000.0
+
+
+def _num(v: Any) -> float:
+    try:
+        f = float(v)
+    except (TypeError, ValueError):
+        return math.nan
+    return f
+
+
+def select_topN(
+    path: Path,
+    topN: int,
+    key: str = "area_ha",
+    batch_size: int = 10_000,
+    src_crs: str = "EPSG:4326",
+) -> List[Dict[str, Any]]:
+    """
+    Stream ``path`` and return the ``topN`` features with the largest ``properties[key]``.
+
+    Memory is O(topN + batch_size). When ``key == "area_ha"`` and a feature lacks it, the
+    equal-area hectares are computed in vectorised batches. Every returned feature has an
+    ``area_ha`` property. Ties keep file order; features with a missing/NaN key are skipped.
+    """
+    from pyproj import Transformer
+
+    tf = Transformer.from_crs(src_crs, EQUAL_AREA_CRS, always_xy=True)
+    heap: list = []  # (value, -seq, feature): min-heap of the current best N
+    seq = 0
+
+    def flush(batch: List[Dict[str, Any]]) -> None:
+        nonlocal seq
+        if key == "area_ha":
+            need = [i for i, f in enumerate(batch) if math.isnan(_num(_props(f).get("area_ha")))]
+            if need:
+                areas = equal_area_ha([batch[i].get("geometry") for i in need], tf)
+                for i, a in zip(need, areas):
+                    _props(batch[i])["area_ha"] = float(a)
+        for f in batch:
+            v = _num(_props(f).get(key))
+            seq += 1
+            if math.isnan(v):
+                continue
+            item = (v, -seq, f)
+            if len(heap) < topN:
+                heapq.heappush(heap, item)
+            elif item[:2] > heap[0][:2]:
+                heapq.heapreplace(heap, item)
+
+    if topN <= 0:
+        return []
+    batch: List[Dict[str, Any]] = []
+    for feat in iter_geojson_features(path):
+        batch.append(feat)
+        if len(batch) >= batch_size:
+            flush(batch)
+            batch = []
+    if batch:
+        flush(batch)
+
+    best = [f for _, _, f in sorted(heap, key=lambda t: (-t[0], -t[1]))]
+    missing = [f for f in best if math.isnan(_num(_props(f).get("area_ha")))]
+    if missing:
+        for f, a in zip(missing, equal_area_ha([f.get("geometry") for f in missing], tf)):
+            _props(f)["area_ha"] = float(a)
+    return best
+
+
+def _props(feat: Dict[str, Any]) -> Dict[str, Any]:
+    p = feat.get("properties")
+    if p is None:
+        p = feat["properties"] = {}
+    return p
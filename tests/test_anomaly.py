@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("sklearn")
+from zexplorer.anomaly import score_tiles, tile_feature_names, tile_origins  # noqa: E402
+
+
+def _layers(seed: int = 0, size: int = 512):
+    rng = np.random.default_rng(seed)
+    s1 = rng.normal(0, 1, (size, size)).astype("float32")
+    alos = rng.normal(0, 1, (size, size)).astype("float32")
+    relief = rng.normal(0, 0.5, (size, size)).astype("float32")
+    return s1, alos, relief
+
+
+def test_tile_origins_cover_full_tiles_only():
+    o = tile_origins((130, 200), 64)
+    assert len(o) == 2 * 3
+    assert o.max(axis=0).tolist() == [64, 128]
+
+
+def test_planted_rectilinear_feature_ranks_first():
+    s1, alos, relief = _layers()
+    # Ditch-like rectangle in ALOS-2 plus a wet S1 response inside tile (row 3, col 5)
+    r0, c0 = 3 * 64 + 10, 5 * 64 + 10
+    alos[r0 : r0 + 3, c0 : c0 + 40] += 6
+    alos[r0 + 37 : r0 + 40, c0 : c0 + 40] += 6
+    alos[r0 : r0 + 40, c0 : c0 + 3] += 6
+    s1[r0 : r0 + 40, c0 : c0 + 40] += 3
+    relief[::64, :] = np.nan  # a few NaNs must not break features
+
+    res = score_tiles({"s1": s1, "alos": alos, "relief": relief}, tile=64, sample=40)
+    assert res.features.shape == (64, len(tile_feature_names(["s1", "alos", "relief"])))
+    top = res.origins[np.argmax(res.scores)]
+    assert tuple(top) == (3 * 64, 5 * 64)
+    assert res.tiles_per_s > 0
+
+
+def test_mostly_invalid_tiles_are_dropped():
+    s1, alos, relief = _layers(size=256)
+    s1[:64, :64] = np.nan
+    res = score_tiles({"s1": s1, "relief": relief}, tile=64, sample=16)
+    assert len(res.scores) == 15 and res.n_tiles == 16
+    assert (0, 0) not in {tuple(o) for o in res.origins}
+
+
+def test_fit_sample_features_are_reused_not_recomputed(monkeypatch):
+    import zexplorer.anomaly as an
+
+    s1, alos, relief = _layers(size=384)
+    s1[:64, :64] = np.nan
+    layers = {"s1": s1, "relief": relief}
+    seen = []
+    real = an.tile_features
+    monkeypatch.setattr(
+        an,
+        "tile_features",
+        lambda lay, o, *a, **k: seen.extend(map(tuple, o)) or real(lay, o, *a, **k),
+    )
+    res = an.score_tiles(layers, tile=64, sample=20, batch=7)
+    assert sorted(seen) == sorted(map(tuple, tile_origins(s1.shape, 64)))  # each tile once
+    # Same features and raster order as a plain extraction of every kept tile
+    want, keep = real(layers, tile_origins(s1.shape, 64), 64, an.layer_stretch(layers))
+    np.testing.assert_array_equal(res.origins, tile_origins(s1.shape, 64)[keep])
+    np.testing.assert_array_equal(res.features, want)
@@ -0,0 +1,101 @@
+from pathlib import Path
+import warnings
+
+import numpy as np
+import pytest
+
+rasterio = pytest.importorskip("rasterio")
+from rasterio.transform import from_origin  # noqa: E402
+
+from zexplorer.compositor import nanmedian0, seasonal_delta, to_db  # noqa: E402
+
+TR = from_origin(-50.0, -0.5, 0.001, 0.001)
+
+
+def _write_tif(path: Path, arr: np.ndarray, transform=TR, nodata=None) -> Path:
+    with rasterio.open(
+        path,
+        "w",
+        driver="GTiff",
+        height=arr.shape[0],
+        width=arr.shape[1],
+        count=1,
+        dtype=arr.dtype,
+        crs="EPSG:4326",
+        transform=transform,
+        nodata=nodata,
+    ) as ds:
+        ds.write(arr, 1)
+    return path
+
+
+def test_nanmedian0_matches_numpy():
+    rng = np.random.default_rng(0)
+    s = rng.normal(0, 1, (7, 30, 40)).astype("float32")
+    s[rng.random(s.shape) < 0.3] = np.nan
+    s[:, 0, 0] = np.nan
+    med, k = nanmedian0(s)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        ref = np.nanmedian(s, axis=0)
+    np.testing.assert_allclose(med, ref, rtol=1e-6, equal_nan=True)
+    np.testing.assert_array_equal(k, np.isfinite(s).sum(axis=0))
+
+
+def test_to_db_units():
+    lin = np.array([1.0, 0.1, 0.0], dtype="float32")
+    np.testing.assert_allclose(to_db(lin.copy(), "linear"), [0.0, -10.0, np.nan], equal_nan=True)
+    dn = np.array([1000.0, 0.0], dtype="float32")
+    np.testing.assert_allclose(to_db(dn, "dn"), [-23.0, np.nan], rtol=1e-6, equal_nan=True)
+    with pytest.raises(ValueError):
+        to_db(lin, "amp")
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_seasonal_delta_matches_in_memory_median(tmp_path: Path, workers):
+    rng = np.random.default_rng(1)
+    shape = (70, 90)  # not a multiple of the block size
+    wet = [rng.normal(-8, 2, shape).astype("float32") for _ in range(5)]
+    dry = [rng.normal(-11, 2, shape).astype("float32") for _ in range(4)]
+    wet[0][:10, :10] = -9999.0  # nodata
+    for d in dry:
+        d[5:8, 60:] = -9999.0  # no valid dry scenes here
+    wp = [_write_tif(tmp_path / f"w{i}.tif", a, nodata=-9999.0) for i, a in enumerate(wet)]
+    dp = [_write_tif(tmp_path / f"d{i}.tif", a, nodata=-9999.0) for i, a in enumerate(dry)]
+
+    out = tmp_path / "exports" / "aoi_S1VV_delta_db.tif"
+    res = seasonal_delta(wp, dp, out, block=32, workers=workers, composites=True)
+    assert res.blocks == 3 * 3 and res.wet.name == "aoi_S1VV_wet_db.tif"
+
+    def med(stack):
+        s = np.stack(stack)
+        s[s == -9999.0] = np.nan
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            return np.nanmedian(s, axis=0)
+
+    ref = med(wet) - med(dry)
+    with rasterio.open(out) as ds:
+        got = ds.read(1)
+        assert ds.transform == TR and ds.dtypes[0] == "float32"
+    np.testing.assert_allclose(got, ref, rtol=1e-5, equal_nan=True)
+    assert np.isnan(got[5:8, 60:]).all()
+    assert res.valid_px == int(np.isfinite(ref).sum())
+    assert not list(out.parent.glob("*.tmp"))
+
+
+def test_seasonal_delta_min_scenes_and_regrid(tmp_path: Path):
+    base = np.full((40, 40), -10.0, dtype="float32")
+    wp = [_write_tif(tmp_path / f"w{i}.tif", base + 3.0) for i in range(2)]
+    # Dry scene on a finer grid covering the same area → warped onto the wet grid
+    fine = from_origin(-50.0, -0.5, 0.0005, 0.0005)
+    dp = [_write_tif(tmp_path / "d0.tif", np.full((80, 80), -10.0, "float32"), fine)]
+    out = tmp_path / "x_ALOS2_delta_db.tif"
+    res = seasonal_delta(wp, dp, out, block=16, workers=2)
+    with rasterio.open(out) as ds:
+        np.testing.assert_allclose(ds.read(1), 3.0, atol=1e-5)
+    assert res.shape == (40, 40)
+
+    seasonal_delta(wp, dp, out, block=16, min_scenes=2)
+    with rasterio.open(out) as ds:
+        assert np.isnan(ds.read(1)).all()
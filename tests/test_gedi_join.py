@@ -0,0 +1,66 @@
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+shapely = pytest.importorskip("shapely")
+from shapely.geometry import Point, box  # noqa: E402
+
+from zexplorer.gedi_join import iter_gedi_chunks, join_wsci  # noqa: E402
+
+
+def _points(n: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    lon = -50.0 + rng.random(n)
+    lat = -1.0 + rng.random(n)
+    w = rng.normal(10, 2, n)
+    w[::50] = -9999.0  # fill values are ignored
+    return lon, lat, w
+
+
+def test_join_matches_brute_force(tmp_path: Path):
+    lon, lat, w = _points(20_000)
+    polys = [box(-49.8, -0.8, -49.7, -0.7), box(-49.5, -0.5, -49.45, -0.3)]
+    chunks = [
+        (lon[i : i + 3000], lat[i : i + 3000], w[i : i + 3000]) for i in range(0, 20_000, 3000)
+    ]
+    rows = join_wsci(polys, chunks, ring_m=2000.0)
+
+    d = 2000.0 / 111_320.0
+    for poly, row in zip(polys, rows):
+        ring = poly.buffer(d).difference(poly)
+        valid = w > -9999.0
+        inside = np.array([poly.intersects(Point(x, y)) for x, y in zip(lon, lat)]) & valid
+        inring = np.array([ring.intersects(Point(x, y)) for x, y in zip(lon, lat)]) & valid
+        assert row["n_in"] == inside.sum()
+        assert row["n_ring"] == inring.sum()
+        assert row["wsci_mean_in"] == pytest.approx(w[inside].mean(), rel=1e-5)
+        assert row["wsci_p50_ring"] == pytest.approx(np.median(w[inring]), rel=1e-5)
+        assert row["contrast_mean"] == pytest.approx(
+            w[inside].mean() - w[inring].mean(), rel=1e-4, abs=1e-4
+        )
+
+
+def test_empty_candidate_and_readers(tmp_path: Path):
+    lon, lat, w = _points(500, seed=1)
+    csv = tmp_path / "gedi_wsci_points.csv"
+    csv.write_text(
+        "lat,lon,WSCI,granule\n" + "".join(f"{b},{a},{c},g\n" for a, b, c in zip(lon, lat, w))
+    )
+    gj = tmp_path / "gedi_wsci_points.geojson"
+    feats = [
+        {
+            "type": "Feature",
+            "properties": {"WSCI": c},
+            "geometry": {"type": "Point", "coordinates": [a, b]},
+        }
+        for a, b, c in zip(lon, lat, w)
+    ]
+    gj.write_text(json.dumps({"type": "FeatureCollection", "features": feats}))
+
+    polys = [box(-49.9, -0.9, -49.4, -0.4), box(10, 10, 10.1, 10.1)]
+    a = join_wsci(polys, iter_gedi_chunks(csv, chunksize=64))
+    b = join_wsci(polys, iter_gedi_chunks(gj, chunksize=64))
+    assert a[0]["n_in"] == b[0]["n_in"] > 0
+    assert a[1]["n_in"] == 0 and np.isnan(a[1]["wsci_mean_in"])
@@ -0,0 +1,97 @@
+from pathlib import Path
+import threading
+import time
+
+from zexplorer.granule_search import (
+    GranuleQuery,
+    SearchCache,
+    concurrent_search,
+    split_temporal,
+)
+
+RING = ((-50.0, -1.0), (-49.0, -1.0), (-49.0, 0.0), (-50.0, 0.0), (-50.0, -1.0))
+
+
+class FakeCMR:
+    """Local stand-in for earthaccess.search_data: granules keyed by daac, one per year."""
+
+    def __init__(self, by_daac, fail_daac="-", barrier=None):
+        self.by_daac = by_daac
+        self.fail_daac = fail_daac
+        self.barrier = barrier
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def __call__(self, short_name, version, temporal, polygon, daac):
+        with self.lock:
+            self.calls.append((daac, temporal))
+        if self.barrier is not None:
+            self.barrier.wait(timeout=5)
+        if daac == self.fail_daac:
+            raise RuntimeError("503")
+        s, e = temporal
+        return [
+            {"meta": {"concept-id": f"G-{daac}-{y}"}, "umm": {"year": y}}
+            for y in self.by_daac.get(daac, [])
+            if s[:4] <= str(y) <= e[:4]
+        ]
+
+
+def _cands(start="2019-01-01", end="2022-12-31"):
+    return [
+        GranuleQuery("GEDI04_C", "2", RING, start, end, daac=None),
+        GranuleQuery("GEDI04_C", "2", RING, start, end, daac="ORNL_DAAC"),
+    ]
+
+
+def test_split_temporal_covers_range_without_gaps():
+    parts = split_temporal("2019-04-01", "2021-06-30", months=12)
+    assert parts[0][0] == "2019-04-01" and parts[-1][1] == "2021-06-30"
+    assert len(parts) == 3
+    assert split_temporal("2020-01-01", "2020-01-01") == [("2020-01-01", "2020-01-01")]
+
+
+def test_queries_run_concurrently_and_priority_order_wins(tmp_path: Path):
+    # 2 candidates x 4 yearly sub-ranges must all be in flight together to pass the barrier
+    cmr = FakeCMR({None: [], "ORNL_DAAC": [2019, 2021]}, barrier=threading.Barrier(8))
+    i, res = concurrent_search(cmr, _cands(), cache=SearchCache(tmp_path), max_workers=8)
+    assert len(cmr.calls) == 8
+    assert i == 1
+    assert [r["umm"]["year"] for r in res] == [2019, 2021]
+
+
+def test_repeat_run_is_served_from_cache_until_ttl(tmp_path: Path):
+    cmr = FakeCMR({None: [2020]})
+    cache = SearchCache(tmp_path, ttl_s=3600)
+    first = concurrent_search(cmr, _cands(), cache=cache)
+    n = len(cmr.calls)
+    second = concurrent_search(cmr, _cands(), cache=cache)
+    assert second == first
+    assert len(cmr.calls) == n  # no network on the repeat
+
+    stale = SearchCache(tmp_path, ttl_s=0)
+    time.sleep(0.01)
+    concurrent_search(cmr, _cands(), cache=stale)
+    assert len(cmr.calls) == 2 * n
+
+
+def test_failed_subqueries_skip_candidate_and_are_not_cached(tmp_path: Path):
+    cmr = FakeCMR({None: [2020], "ORNL_DAAC": [2020]}, fail_daac=None)
+    cache = SearchCache(tmp_path)
+    i, res = concurrent_search(cmr, _cands(), cache=cache)
+    assert i == 1 and res[0]["meta"]["concept-id"] == "G-ORNL_DAAC-2020"
+    n = len(cmr.calls)
+    concurrent_search(cmr, _cands(), cache=cache)
+    assert len(cmr.calls) - n == 4  # only the failed cloud sub-ranges are retried
+
+
+def test_cached_top_priority_hit_skips_failed_lower_candidates(tmp_path: Path):
+    cands = _cands() + [GranuleQuery("GEDI04_C", "2", RING, "2019-01-01", "2022-12-31", "PAD")]
+    cmr = FakeCMR({None: [2020], "ORNL_DAAC": [2020]}, fail_daac="PAD")
+    cache = SearchCache(tmp_path)
+    first = concurrent_search(cmr, cands, cache=cache)
+    assert first[0] == 0
+    n = len(cmr.calls)
+    # The padded query failed (not cached), but the cloud answer is cached and wins anyway
+    assert concurrent_search(cmr, cands, cache=cache) == first
+    assert len(cmr.calls) == n
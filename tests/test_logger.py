@@ -1,6 +1,15 @@
+import hashlib
+import importlib.util
+import json
+import os
 from pathlib import Path
 
-from zexplorer.data_id_logger import DataSource, log_evidence
+import pandas as pd
+import pytest
+from shapely.geometry import box
+
+import zexplorer.data_id_logger as dl
+from zexplorer.data_id_logger import DataSource, log_evidence, sha256_file
 
 
 def test_log_evidence(tmp_path: Path, monkeypatch):
@@ -17,3 +26,126 @@ def test_log_evidence(tmp_path: Path, monkeypatch):
     txt = log_path.read_text().strip()
     assert '"candidate_id": "test-0001"' in txt
     assert '"id": "S2A_TEST_TILE"' in txt
+
+
+def test_sha256_file_streams_in_chunks(tmp_path: Path):
+    p = tmp_path / "raster.bin"
+    data = bytes(range(256)) * 4099
+    p.write_bytes(data)
+    assert sha256_file(p, chunk_size=1000) == hashlib.sha256(data).hexdigest()
+
+
+def test_file_digests_cache_by_size_and_mtime(tmp_path: Path, monkeypatch):
+    cache = tmp_path / "digests.json"
+    old = tmp_path / "old.tif"
+    new = tmp_path / "new.tif"
+    old.write_bytes(b"a" * 5000)
+    new.write_bytes(b"b" * 5000)
+    os.utime(old, (1_600_000_000, 1_600_000_000))
+
+    first = dl.file_digests([old, new], cache_path=cache)
+    calls = []
+    real = dl.sha256_file
+    monkeypatch.setattr(dl, "sha256_file", lambda p: calls.append(Path(p).name) or real(p))
+
+    again = dl.file_digests([old, new], cache_path=cache)
+    assert again == first
+    assert calls == ["new.tif"]  # just-written file is never trusted from cache
+
+    old.write_bytes(b"c" * 6000)
+    os.utime(old, (1_600_000_100, 1_600_000_100))
+    assert dl.file_digests([old], cache_path=cache)[str(old)] != first[str(old)]
+
+
+def test_file_digests_keys_every_alias(tmp_path: Path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "fresh.csv").write_text("x,y\n1,2\n")
+    calls = []
+    real = dl.sha256_file
+    monkeypatch.setattr(dl, "sha256_file", lambda p: calls.append(p) or real(p))
+    names = ["fresh.csv", str(tmp_path / "fresh.csv"), "./fresh.csv"]
+    got = dl.file_digests(names, cache_path=tmp_path / "digests.json")
+    assert set(got) == {str(Path(n)) for n in names}
+    assert len(set(got.values())) == 1 and len(calls) == 1
+
+
+def _load_script(name: str):
+    path = Path(__file__).resolve().parents[1] / "scripts" / f"{name}.py"
+    spec = importlib.util.spec_from_file_location(name, path)
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+def _read_log(path: Path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_pipeline_log_candidates_pins_input_digests(tmp_path: Path, monkeypatch):
+    for mod in ("geopandas", "rasterio", "skimage"):
+        pytest.importorskip(mod)
+    import geopandas as gpd
+
+    pipe = _load_script("run_marajo_pipeline")
+    log_path = tmp_path / "evidence.jsonl"
+    monkeypatch.setenv("ZEXP_LOG_PATH", str(log_path))
+    top = gpd.GeoDataFrame(
+        {"area_ha": [12.0, 8.0]},
+        geometry=[box(-50.0, -1.0, -49.9, -0.9), box(-49.5, -0.8, -49.4, -0.7)],
+        crs="EPSG:4326",
+    )
+    scores = pd.DataFrame({"idx": [2, 1], "frac_ok": [0.7, 0.4]})
+    digests = {
+        "data/exports/aoi_S1VV_delta_db.tif": "ab" * 32,
+        "data/exports/aoi_DEM_30m.tif": "cd" * 32,
+    }
+    pipe.log_candidates(top, scores, "aoi", digests)
+
+    recs = _read_log(log_path)
+    assert [r["candidate_id"] for r in recs] == ["marajo-hot-0101", "marajo-hot-0102"]
+    for r in recs:
+        assert r["extra"]["input_sha256"] == {
+            "aoi_S1VV_delta_db.tif": "ab" * 32,
+            "aoi_DEM_30m.tif": "cd" * 32,
+        }
+    assert recs[1]["extra"]["frac_ok"] == 0.7
+
+
+def test_gedi_evidence_pins_granule_digests(tmp_path: Path, monkeypatch):
+    for mod in ("earthaccess", "h5py", "geopandas"):
+        pytest.importorskip(mod)
+    gedi = _load_script("gedi_wsci_extract")
+    log_path = tmp_path / "evidence.jsonl"
+    monkeypatch.setenv("ZEXP_LOG_PATH", str(log_path))
+    monkeypatch.setenv("ZEXP_DIGEST_CACHE", str(tmp_path / "digests.json"))
+    granule = tmp_path / "GEDI04_C_2019_O0001.h5"
+    points = tmp_path / "gedi_wsci_points.csv"
+    granule.write_bytes(b"\x89HDF" * 100)
+    points.write_text("lat,lon,WSCI\n-1,-49.5,7.5\n")
+    gedi.log_gedi_evidence(
+        "aoi-0001", [-50, -1, -49, 0], "2019-04-01", "2020-01-01", [granule], points
+    )
+
+    (rec,) = _read_log(log_path)
+    assert rec["extra"]["input_sha256"] == {
+        granule.name: hashlib.sha256(granule.read_bytes()).hexdigest(),
+        points.name: hashlib.sha256(points.read_bytes()).hexdigest(),
+    }
+
+
+def test_gedi_evidence_ignores_points_csv_not_written_this_run(tmp_path: Path, monkeypatch):
+    for mod in ("earthaccess", "h5py", "geopandas"):
+        pytest.importorskip(mod)
+    gedi = _load_script("gedi_wsci_extract")
+    log_path = tmp_path / "evidence.jsonl"
+    monkeypatch.setenv("ZEXP_LOG_PATH", str(log_path))
+    monkeypatch.setenv("ZEXP_DIGEST_CACHE", str(tmp_path / "digests.json"))
+    granule = tmp_path / "GEDI04_C_2019_O0001.h5"
+    granule.write_bytes(b"\x89HDF" * 100)
+    (tmp_path / "gedi_wsci_points.csv").write_text("lat,lon,WSCI\n-1,-49.5,7.5\n")  # stale
+    gedi.log_gedi_evidence(
+        "aoi-0001", [-50, -1, -49, 0], "2019-04-01", "2020-01-01", [granule], None
+    )
+
+    (rec,) = _read_log(log_path)
+    assert list(rec["extra"]["input_sha256"]) == [granule.name]
@@ -0,0 +1,31 @@
+from pathlib import Path
+
+from zexplorer.manifest import Manifest, file_digest, stage_key
+
+
+def test_stage_key_ignores_kwarg_order_and_tracks_values():
+    assert stage_key(a=1, b="x") == stage_key(b="x", a=1)
+    assert stage_key(a=1, b="x") != stage_key(a=2, b="x")
+
+
+def test_file_digest_changes_with_content(tmp_path: Path):
+    p = tmp_path / "in.bin"
+    p.write_bytes(b"abc" * 1000)
+    d1 = file_digest(p)
+    p.write_bytes(b"abd" * 1000)
+    assert file_digest(p) != d1
+
+
+def test_manifest_freshness_roundtrip(tmp_path: Path):
+    out = tmp_path / "fig.png"
+    out.write_bytes(b"png")
+    m = Manifest.load(tmp_path / "manifest.json")
+    assert not m.is_fresh("render/1", "k1")
+    m.record("render/1", "k1", [out])
+    m.save()
+
+    m2 = Manifest.load(tmp_path / "manifest.json")
+    assert m2.is_fresh("render/1", "k1")
+    assert not m2.is_fresh("render/1", "k2")
+    out.unlink()
+    assert not m2.is_fresh("render/1", "k1")  # missing output forces a re-run
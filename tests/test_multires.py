@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+
+from zexplorer.multires import _block_relief, coarse_to_fine, exhaustive, local_relief, recall
+
+
+def _scene(size: int = 2048, sites: int = 12, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    s1 = rng.normal(-0.5, 0.6, (size, size)).astype("float32")
+    rel = rng.normal(3.0, 3.0, (size, size)).astype("float32")
+    for _ in range(sites):
+        r, c = rng.integers(0, size - 160, 2)
+        n = int(rng.integers(40, 160))
+        s1[r : r + n, c : c + n] += 2.0
+    rel[:50, :50] = np.nan
+    return s1, rel
+
+
+def _dem_scene(size: int = 2048, sites: int = 12, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    s1 = rng.normal(-0.5, 0.6, (size, size)).astype("float32")
+    yy, xx = np.mgrid[0:size, 0:size].astype("float32")
+    dem = 20 + 0.01 * xx + 5 * np.sin(yy / 300.0) + rng.normal(0, 3.0, (size, size))
+    dem = dem.astype("float32")
+    for _ in range(sites):
+        r, c = rng.integers(0, size - 160, 2)
+        n = int(rng.integers(40, 160))
+        s1[r : r + n, c : c + n] += 2.0
+    for _ in range(sites // 2):  # rough patches fail the relief rule
+        r, c = rng.integers(0, size - 200, 2)
+        dem[r : r + 200, c : c + 200] += rng.normal(0, 15.0, (200, 200))
+    dem[:50, :50] = np.nan
+    return s1, dem
+
+
+def test_exhaustive_matches_brute_force():
+    s1, rel = _scene(size=256, sites=2)
+    res = exhaustive(s1, rel, tile=64, min_frac=0.3)
+    for r in range(0, 256, 64):
+        for c in range(0, 256, 64):
+            f = np.mean((s1[r : r + 64, c : c + 64] > 0.5) & (rel[r : r + 64, c : c + 64] <= 5.0))
+            assert ((r, c) in {tuple(o) for o in res.origins}) == (f >= 0.3)
+
+
+@pytest.mark.parametrize("levels", [1, 3, 5])
+def test_coarse_to_fine_full_recall_with_large_saving(levels):
+    s1, dem = _dem_scene()
+    truth = exhaustive(s1, dem=dem)
+    found = coarse_to_fine(s1, dem=dem, levels=levels)
+    assert len(truth.origins) > 0
+    assert recall(found, truth) == 1.0
+    # Savings count relief derivation, not just the threshold comparisons
+    assert found.relief_total_px == dem.size and found.relief_px < dem.size
+    assert found.compute_saved > (0.7 if levels > 1 else 0.5)
+    # Native-level scores are exact, not estimates
+    got = dict(zip(map(tuple, found.origins), found.scores))
+    for o, f in zip(map(tuple, truth.origins), truth.scores):
+        assert got[o] == pytest.approx(f)
+
+
+def test_rejects_tile_not_divisible_by_pyramid():
+    s1, rel = _scene(size=256, sites=1)
+    with pytest.raises(ValueError):
+        coarse_to_fine(s1, rel, tile=48, levels=5)
+
+
+def test_block_relief_matches_full_pass_at_native_step():
+    _, dem = _dem_scene(size=300, sites=2)
+    full = local_relief(dem)
+    for r0, r1, c0, c1 in [(0, 64, 0, 64), (64, 192, 128, 256), (236, 300, 0, 300)]:
+        got, n = _block_relief(dem, r0, r1, c0, c1, 1, 5.0)
+        np.testing.assert_array_equal(got, full[r0:r1, c0:c1])
+        assert n >= got.size
+
+
+def test_precomputed_relief_counts_as_full_pass():
+    s1, rel = _scene(size=256, sites=1)
+    res = coarse_to_fine(s1, rel, levels=2)
+    assert res.relief_px == res.relief_total_px == rel.size
+    with pytest.raises(ValueError):
+        coarse_to_fine(s1, rel, dem=rel)
@@ -0,0 +1,71 @@
+import os
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+rasterio = pytest.importorskip("rasterio")
+from rasterio.transform import from_origin  # noqa: E402
+
+from zexplorer.raster_cache import open_cached  # noqa: E402
+
+
+def _write_tif(path: Path, arr: np.ndarray) -> None:
+    with rasterio.open(
+        path,
+        "w",
+        driver="GTiff",
+        height=arr.shape[0],
+        width=arr.shape[1],
+        count=1,
+        dtype=arr.dtype,
+        crs="EPSG:4326",
+        transform=from_origin(-50.0, -0.5, 0.001, 0.001),
+        compress="deflate",
+        tiled=True,
+        blockxsize=16,
+        blockysize=16,
+    ) as ds:
+        ds.write(arr, 1)
+
+
+def test_open_cached_roundtrip_and_reuse(tmp_path: Path):
+    src = tmp_path / "s1.tif"
+    arr = np.arange(40 * 50, dtype="float32").reshape(40, 50)
+    _write_tif(src, arr)
+
+    c1 = open_cached(src, cache_dir=tmp_path / "cache")
+    assert isinstance(c1.array, np.memmap)
+    assert not c1.array.flags.writeable
+    np.testing.assert_array_equal(c1.array, arr)
+    assert c1.transform == from_origin(-50.0, -0.5, 0.001, 0.001)
+    assert c1.crs.to_epsg() == 4326
+
+    npy = next((tmp_path / "cache").glob("*.npy"))
+    mtime = npy.stat().st_mtime_ns
+    c2 = open_cached(src, cache_dir=tmp_path / "cache")
+    assert npy.stat().st_mtime_ns == mtime  # not re-decoded
+    np.testing.assert_array_equal(c2.array, arr)
+
+
+def test_open_cached_invalidates_on_source_change(tmp_path: Path):
+    src = tmp_path / "dem.tif"
+    _write_tif(src, np.zeros((20, 20), dtype="float32"))
+    open_cached(src, cache_dir=tmp_path / "cache")
+
+    _write_tif(src, np.ones((20, 20), dtype="float32"))
+    st = src.stat()
+    os.utime(src, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    c = open_cached(src, cache_dir=tmp_path / "cache")
+    assert float(c.array.min()) == 1.0
+
+
+def test_read_window_clips_to_array(tmp_path: Path):
+    from rasterio.windows import Window
+
+    src = tmp_path / "s1.tif"
+    arr = np.arange(100, dtype="float32").reshape(10, 10)
+    _write_tif(src, arr)
+    c = open_cached(src, cache_dir=tmp_path / "cache")
+    w = c.read_window(Window(col_off=-2, row_off=7, width=5, height=6))
+    np.testing.assert_array_equal(w, arr[7:10, 0:3])
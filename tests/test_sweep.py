@@ -0,0 +1,32 @@
+import numpy as np
+
+from zexplorer.sweep import frac_ok_grid, joint_histogram, ok_counts, parse_grid
+
+
+def test_parse_grid_range_and_list():
+    np.testing.assert_allclose(parse_grid("0:1:0.25"), [0.0, 0.25, 0.5, 0.75, 1.0])
+    np.testing.assert_allclose(parse_grid("5,1,2.5"), [1.0, 2.5, 5.0])
+
+
+def test_ok_counts_match_brute_force_including_ties_and_nans():
+    rng = np.random.default_rng(1)
+    s1 = rng.choice([-1.0, 0.0, 0.5, 1.0, 1.5, 2.5], size=5000).astype("float32")
+    rel = rng.choice([-2.0, 1.0, 5.0, 7.5, 12.0], size=5000).astype("float32")
+    s1[::97] = np.nan
+    rel[::89] = np.inf
+    s1_thr = parse_grid("0:2:0.5")
+    rel_thr = parse_grid("1,5,10")
+
+    counts = ok_counts(joint_histogram(s1, rel, s1_thr, rel_thr))
+    for j, ts in enumerate(s1_thr):
+        for k, tr in enumerate(rel_thr):
+            expect = np.sum((s1 > ts) & (rel <= tr) & np.isfinite(s1) & np.isfinite(rel))
+            assert counts[j, k] == expect
+
+
+def test_frac_ok_grid_uses_total_pixels_and_handles_empty():
+    s1_thr, rel_thr = np.array([0.5]), np.array([5.0])
+    h = joint_histogram(np.array([1.0, 1.0, 0.0]), np.array([0.0, 9.0, 0.0]), s1_thr, rel_thr)
+    frac = frac_ok_grid(np.stack([h, np.zeros_like(h)]), np.array([4, 0]))
+    assert frac[0, 0, 0] == 0.25  # 1 passing pixel of 4 (one masked pixel was NaN)
+    assert frac[1, 0, 0] == 0.0
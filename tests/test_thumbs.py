@@ -0,0 +1,42 @@
+import numpy as np
+
+from zexplorer.thumbs import RDBU_R_LUT, colorize_db, contact_sheet, render_overview
+
+
+def test_colorize_db_lut_ends_and_nan():
+    db = np.array([[-10.0, 0.0, 10.0, np.nan]], dtype="float32")
+    rgb = colorize_db(db)
+    assert rgb.shape == (1, 4, 3) and rgb.dtype == np.uint8
+    assert tuple(rgb[0, 0]) == tuple(RDBU_R_LUT[0])  # clipped to vmin → blue end
+    assert tuple(rgb[0, 2]) == tuple(RDBU_R_LUT[255])  # clipped to vmax → red end
+    assert rgb[0, 2, 0] > rgb[0, 2, 2] and rgb[0, 0, 2] > rgb[0, 0, 0]
+    assert tuple(rgb[0, 3]) == (255, 255, 255)
+
+
+def test_render_overview_and_contact_sheet(tmp_path):
+    rng = np.random.default_rng(0)
+    right = colorize_db(rng.normal(0, 1, (50, 80)))
+    paths = []
+    for i in range(5):
+        left = None if i % 2 else right
+        im = render_overview(
+            left,
+            right,
+            f"Candidate rank {i} (≈1 ha)",
+            ("A Δ", "B Δ"),
+            extents=(None, (-50.0, -49.9, -0.6, -0.5)),
+            panel=120,
+        )
+        assert im.size[0] == 2 * 120 + 3 * 12
+        # Corner labels only under the panel that has its own extent
+        strip = np.asarray(im)[-18:]
+        assert strip[:, : 12 + 120].min() == 255 and strip[:, 2 * 12 + 120 :].min() < 255
+        p = tmp_path / f"c{i}.png"
+        im.save(p)
+        paths.append(p)
+    sheet = contact_sheet(paths, cols=2, cell=100)
+    assert sheet.size[0] == 200
+    rows, ch = 3, sheet.size[1] // 3
+    assert sheet.size[1] == rows * ch and 20 < ch <= 100 + 20
+    # the sixth cell (last row, right column) stays blank
+    assert np.asarray(sheet)[-ch + 25 :, 100:].min() == 255
@@ -0,0 +1,66 @@
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from zexplorer.topn import iter_geojson_features, select_topN
+
+
+def _square(x: float, y: float, s: float) -> dict:
+    ring = [[x, y], [x + s, y], [x + s, y + s], [x, y + s], [x, y]]
+    return {"type": "Polygon", "coordinates": [ring]}
+
+
+def _write_fc(path: Path, feats: list, **extra) -> None:
+    fc = {"type": "FeatureCollection", **extra, "features": feats}
+    path.write_text(json.dumps(fc, indent=1))
+
+
+def test_iter_features_small_chunks_and_member_order(tmp_path: Path):
+    feats = [
+        {"type": "Feature", "properties": {"i": i, "s": "x,]}" * i}, "geometry": _square(i, 0, 1)}
+        for i in range(25)
+    ]
+    p = tmp_path / "fc.geojson"
+    # "features" before and after other members, tiny chunks to exercise refills
+    p.write_text(json.dumps({"features": feats, "name": "hot", "bbox": [0, 0, 1, 1.5]}))
+    got = list(iter_geojson_features(p, chunk_size=7))
+    assert [f["properties"]["i"] for f in got] == list(range(25))
+
+
+def test_select_topN_by_property_keeps_file_order_on_ties(tmp_path: Path):
+    vals = [3.0, 7.0, 7.0, None, 1.0, 9.0]
+    feats = [
+        {"type": "Feature", "properties": {"id": i, "score": v}, "geometry": _square(0, 0, 0.01)}
+        for i, v in enumerate(vals)
+    ]
+    p = tmp_path / "fc.geojson"
+    _write_fc(p, feats)
+    top = select_topN(p, 3, key="score", batch_size=2)
+    assert [f["properties"]["id"] for f in top] == [5, 1, 2]
+    assert all(f["properties"]["area_ha"] > 0 for f in top)
+
+
+def test_select_topN_equal_area_matches_geopandas(tmp_path: Path):
+    gpd = pytest.importorskip("geopandas")
+    rng = np.random.default_rng(0)
+    feats = []
+    for i in range(50):
+        g = _square(-50 + rng.random(), -1 + rng.random(), 0.001 + 0.02 * rng.random())
+        if i % 7 == 0:  # punch a hole
+            x0, y0 = g["coordinates"][0][0]
+            s = g["coordinates"][0][1][0] - x0
+            hole = _square(x0 + s / 4, y0 + s / 4, s / 2)["coordinates"][0][::-1]
+            g["coordinates"].append(hole)
+        feats.append({"type": "Feature", "properties": {"id": i}, "geometry": g})
+    p = tmp_path / "fc.geojson"
+    _write_fc(p, feats)
+
+    top = select_topN(p, 5, batch_size=8)
+    ref = gpd.read_file(p).to_crs(6933)
+    ref = ref.assign(area_ha=ref.area / 10_000.0).sort_values("area_ha", ascending=False)
+    assert [f["properties"]["id"] for f in top] == list(ref["id"].head(5))
+    np.testing.assert_allclose(
+        [f["properties"]["area_ha"] for f in top], ref["area_ha"].head(5), rtol=1e-9
+    )